@@ -0,0 +1,88 @@
+import pygame
+from bisect import bisect_right
+from settings import *
+
+class ActiveRegion:
+    """Mantém acordados só os sprites da fase perto da câmera.
+
+    Sprites fora da região (tela + margem) ficam dormindo numa lista
+    ordenada por x e acordam quando a câmera chega perto. Assim o custo
+    por frame depende do que está na tela, não do tamanho da fase.
+    """
+    def __init__(self, camera, margin=ACTIVE_MARGIN):
+        self.camera = camera
+        self.margin = margin
+        self.active = pygame.sprite.Group()
+        self.mirrors = []
+        # Ordenados do mais longe para o mais perto (pop() pega o próximo)
+        self._keys = []
+        self._dormant = []
+
+    def track(self, source, mirror=None):
+        """Grupo com os sprites de `source` que estão acordados.
+
+        `mirror` pode ser um grupo próprio; se ele tiver `accepts(sprite)`,
+        só recebe os sprites que aceitar.
+        """
+        if mirror is None:
+            mirror = pygame.sprite.Group()
+        self.mirrors.append((source, mirror))
+        return mirror
+
+    def bounds(self):
+        view = self.camera.view
+        return view.left - self.margin, view.right + self.margin
+
+    def add(self, *sprites):
+        for sprite in sprites:
+            self._sleep(sprite)
+
+    def _sleep(self, sprite):
+        key = -sprite.rect.left
+        i = bisect_right(self._keys, key)
+        self._keys.insert(i, key)
+        self._dormant.insert(i, sprite)
+
+    def _wake(self, sprite):
+        self.active.add(sprite)
+        for source, mirror in self.mirrors:
+            if source.has(sprite) and getattr(mirror, 'accepts', bool)(sprite):
+                mirror.add(sprite)
+
+    def _drop(self, sprite):
+        self.active.remove(sprite)
+        for source, mirror in self.mirrors:
+            mirror.remove(sprite)
+
+    def refresh(self):
+        left, right = self.bounds()
+
+        # 1. Quem saiu da região volta a dormir
+        for sprite in self.active.sprites():
+            if sprite.rect.right < left:
+                # Já passou; a câmera só anda para frente
+                self._drop(sprite)
+            elif sprite.rect.left > right:
+                self._drop(sprite)
+                self._sleep(sprite)
+
+        # 2. Acorda quem entrou na região pela frente
+        while self._dormant and -self._keys[-1] <= right:
+            self._keys.pop()
+            sprite = self._dormant.pop()
+            if sprite.alive() and sprite.rect.right >= left:
+                self._wake(sprite)
+
+    def visible(self, group=None):
+        """Sprites acordados (de `group`, se passado) que aparecem na tela."""
+        view = self.camera.view
+        if group is None:
+            group = self.active
+        return [s for s in group if s.rect.colliderect(view)]
+
+    def clear(self):
+        self.active.empty()
+        for source, mirror in self.mirrors:
+            mirror.empty()
+        self._keys = []
+        self._dormant = []
@@ -0,0 +1,332 @@
+import pygame
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+GAME_FOLDER = os.path.dirname(__file__)
+ASSETS_FOLDER = os.path.join(GAME_FOLDER, 'assets')
+# Threads que decodificam/escalam PNGs em segundo plano
+PREFETCH_WORKERS = 2
+
+def _spec(fname, size=None, flip=False, alpha=True):
+    return fname, size, flip, alpha
+
+def _decode(path, size):
+    # Roda numa thread: só lê e escala. O convert() precisa da thread principal.
+    img = pygame.image.load(path)
+    if size is not None:
+        img = pygame.transform.scale(img, size)
+    return img
+
+def _decode_strip(path, frame_size, count, height):
+    sheet = pygame.image.load(path)
+    return _cut_strip(sheet, frame_size, count, height)
+
+def _cut_strip(sheet, frame_size, count, height):
+    w, h = sheet.get_size()
+    if count is None:
+        count = w // h if w > h else 1
+    frame_w = w // count
+    if frame_size is None:
+        # Mantém a proporção com a altura pedida (fundos do tamanho da tela)
+        ratio = height / h
+        frame_size = (int(frame_w * ratio), int(h * ratio))
+    return [pygame.transform.scale(sheet.subsurface((i * frame_w, 0, frame_w, h)), frame_size)
+            for i in range(count)]
+
+class AssetCache:
+    """Cache único de imagens do jogo.
+
+    Cada superfície é guardada pela chave (arquivo, tamanho, espelhada, alpha),
+    então carregar o mesmo PNG várias vezes só lê o disco uma vez.
+
+    `prefetch` adianta a leitura e a escala numa thread; o pedido fica
+    pendente até `collect()` (ou o primeiro `get`) convertê-lo para o
+    formato da tela na thread principal.
+    """
+    def __init__(self, folder=ASSETS_FOLDER):
+        self.folder = folder
+        self.surfaces = {}
+        self.strips = {}
+        self.missing = set()
+        self.hits = 0
+        self.misses = 0
+        self.executor = None
+        self.pending = {}
+        self.pending_strips = {}
+        self.jobs_total = 0
+        self.jobs_done = 0
+        # Pacote de imagens já escaladas (asset_pack) e quantas ainda faltam nele
+        self.pack = None
+        self.unbaked = 0
+        # Atlas (atlas.Atlas) onde as imagens escaladas com alpha são guardadas
+        self.atlas = None
+
+    def use_pack(self, pack):
+        self.pack = pack
+
+    def use_atlas(self, atlas):
+        self.atlas = atlas
+
+    def _store(self, key, surf):
+        fname, size, flip, alpha = key
+        if alpha and size is not None:
+            surf = self._to_atlas(surf)
+        self.surfaces[key] = surf
+        return surf
+
+    def _store_strip(self, key, frames):
+        if key[3]:
+            frames = [self._to_atlas(frame) for frame in frames]
+        self.strips[key] = frames
+        return frames
+
+    def _to_atlas(self, surf):
+        # Só imagens pequenas; fundos e faixas grandes ficam em superfícies próprias
+        if self.atlas is None:
+            return surf
+        w, h = surf.get_size()
+        limit = self.atlas.page_size // 2
+        if w > limit or h > limit:
+            return surf
+        return self.atlas.add(surf)
+
+    def _from_pack(self, key, alpha):
+        if self.pack is None:
+            return None
+        surf = self.pack.get(key)
+        if surf is None:
+            return None
+        return surf.convert_alpha() if alpha else surf.convert()
+
+    def _source(self, fname, alpha):
+        # PNG original, só para escalar/cortar: não entra no cache (ocupa
+        # muito mais que as versões escaladas), a não ser que já estivesse lá
+        surf = self.surfaces.get((fname, None, False, alpha))
+        if surf is not None:
+            return surf
+        if fname in self.missing:
+            raise FileNotFoundError(fname)
+        path = os.path.join(self.folder, fname)
+        try:
+            img = pygame.image.load(path)
+        except (pygame.error, FileNotFoundError):
+            # Guarda a falha para não tentar o disco de novo a cada sprite
+            self.missing.add(fname)
+            raise
+        return img.convert_alpha() if alpha else img.convert()
+
+    def _finish(self, future, fname, alpha):
+        # Thread principal: espera (se ainda não acabou) e converte
+        try:
+            result = future.result()
+        except (pygame.error, FileNotFoundError):
+            self.missing.add(fname)
+            raise FileNotFoundError(fname)
+        finally:
+            self.jobs_done += 1
+        if isinstance(result, list):
+            return [img.convert_alpha() if alpha else img.convert() for img in result]
+        return result.convert_alpha() if alpha else result.convert()
+
+    def _load(self, fname, size, flip, alpha):
+        key = (fname, size, flip, alpha)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            return surf
+
+        future = self.pending.pop(key, None)
+        if future is not None:
+            surf = self._finish(future, fname, alpha)
+            self.unbaked += 1
+        elif flip:
+            base = self._load(fname, size, False, alpha)
+            surf = pygame.transform.flip(base, True, False)
+        elif size is not None:
+            surf = self._from_pack(key, alpha)
+            if surf is None:
+                surf = pygame.transform.scale(self._source(fname, alpha), size)
+                self.unbaked += 1
+        else:
+            surf = self._source(fname, alpha)
+
+        return self._store(key, surf)
+
+    def get(self, fname, size=None, flip=False, alpha=True):
+        """Devolve a superfície pronta. Levanta erro se o arquivo não existir."""
+        if size is not None:
+            size = (int(size[0]), int(size[1]))
+        if (fname, size, flip, alpha) in self.surfaces:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return self._load(fname, size, flip, alpha)
+
+    def get_strip(self, fname, frame_size, count=None, alpha=True):
+        """Corta uma imagem em `count` quadros horizontais e escala cada um.
+
+        Sem `count`, usa quadros quadrados (largura // altura), como na
+        folha de explosão.
+        """
+        key = self._strip_key(fname, frame_size, count, alpha, None)
+        return self._get_strip(key, fname, frame_size, count, alpha, None)
+
+    def get_fitted_strip(self, fname, count, height, alpha=True):
+        """Como get_strip, mas cada quadro é escalado para `height` mantendo a proporção."""
+        key = self._strip_key(fname, None, count, alpha, height)
+        return self._get_strip(key, fname, None, count, alpha, height)
+
+    def _strip_key(self, fname, frame_size, count, alpha, height):
+        if frame_size is None:
+            return (fname, ('h', int(height)), count, alpha)
+        return (fname, (int(frame_size[0]), int(frame_size[1])), count, alpha)
+
+    def _get_strip(self, key, fname, frame_size, count, alpha, height):
+        frames = self.strips.get(key)
+        if frames is not None:
+            self.hits += 1
+            return frames
+
+        self.misses += 1
+        future = self.pending_strips.pop(key, None)
+        packed = self.pack.get_frames(key) if self.pack is not None else None
+        if future is not None:
+            frames = self._finish(future, fname, alpha)
+            self.unbaked += 1
+        elif packed is not None:
+            frames = [img.convert_alpha() if alpha else img.convert() for img in packed]
+        else:
+            self.unbaked += 1
+            if frame_size is not None:
+                frame_size = key[1]
+            sheet = self._source(fname, alpha)
+            frames = _cut_strip(sheet, frame_size, count, height)
+
+        return self._store_strip(key, frames)
+
+    def get_tile_row(self, fname, tile_size, width, height, fill_color):
+        """Faixa de chão (ladrilho em cima, cor sólida embaixo) compartilhada.
+
+        Guarda uma faixa por (arquivo, ladrilho, altura, cor) e devolve um
+        pedaço dela (subsurface) com a largura pedida. Vários sprites usam
+        os mesmos pixels; a faixa só é refeita se alguém pedir mais largura.
+        """
+        key = (fname, tile_size, height, fill_color)
+        row = self.strips.get(key)
+        if row is None or row.get_width() < width:
+            self.misses += 1
+            tile = self.get(fname, (tile_size, tile_size))
+            row_w = width if row is None else max(width, row.get_width() * 2)
+            row_w = -(-row_w // tile_size) * tile_size
+            row = pygame.Surface((row_w, height)).convert()
+            row.fill((0, 0, 0))
+            if height > tile_size:
+                row.fill(fill_color, (0, tile_size, row_w, height - tile_size))
+            row.blits([(tile, (x, 0)) for x in range(0, row_w, tile_size)], False)
+            self.strips[key] = row
+        else:
+            self.hits += 1
+        return row.subsurface((0, 0, width, height))
+
+    def preload(self, specs):
+        """Carrega antecipadamente uma lista de (arquivo, tamanho, flip, alpha).
+
+        Também aceita só o nome do arquivo. Arquivos ausentes são ignorados.
+        """
+        for spec in specs:
+            if isinstance(spec, str):
+                spec = (spec,)
+            try:
+                self.get(*spec)
+            except (pygame.error, FileNotFoundError):
+                pass
+
+    def _submit(self, fn, *args):
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(PREFETCH_WORKERS, thread_name_prefix='assets')
+        self.jobs_total += 1
+        return self.executor.submit(fn, *args)
+
+    def prefetch(self, specs):
+        """Como preload, mas lê e escala em segundo plano e volta na hora."""
+        for spec in specs:
+            if isinstance(spec, str):
+                spec = (spec,)
+            fname, size, flip, alpha = _spec(*spec)
+            if size is not None:
+                size = (int(size[0]), int(size[1]))
+            # A versão espelhada sai da normal na hora do get (é barata)
+            key = (fname, size, False, alpha)
+            if key in self.surfaces or key in self.pending or fname in self.missing:
+                continue
+            if self.pack is not None and key in self.pack:
+                # Já está no pacote: ler de lá é mais rápido que mandar para a thread
+                continue
+            self.pending[key] = self._submit(_decode, os.path.join(self.folder, fname), size)
+
+    def prefetch_strip(self, fname, frame_size=None, count=None, alpha=True, height=None):
+        key = self._strip_key(fname, frame_size, count, alpha, height)
+        if key in self.strips or key in self.pending_strips or fname in self.missing:
+            return
+        if self.pack is not None and key in self.pack:
+            return
+        frame_size = None if frame_size is None else key[1]
+        self.pending_strips[key] = self._submit(_decode_strip, os.path.join(self.folder, fname),
+                                                frame_size, count, height)
+
+    def collect(self):
+        """Converte o que as threads já terminaram. Devolve quantos ainda faltam."""
+        for pending, store in ((self.pending, self._store), (self.pending_strips, self._store_strip)):
+            for key, future in list(pending.items()):
+                if not future.done():
+                    continue
+                del pending[key]
+                try:
+                    store(key, self._finish(future, key[0], key[3]))
+                    self.unbaked += 1
+                except FileNotFoundError:
+                    pass
+        return len(self.pending) + len(self.pending_strips)
+
+    def bake(self):
+        """Grava no pacote as imagens escaladas desta sessão. Devolve quantas há nele."""
+        if self.pack is None:
+            return 0
+        self.unbaked = 0
+        return self.pack.write(self.surfaces, self.strips)
+
+    def progress(self):
+        """(prontos, total) dos pedidos em segundo plano desde o último ciclo vazio."""
+        if not self.pending and not self.pending_strips:
+            self.jobs_total = self.jobs_done = 0
+            return (1, 1)
+        return (self.jobs_done, self.jobs_total)
+
+    def evict(self, fname=None):
+        """Remove do cache um arquivo (todas as variações) ou tudo."""
+        if fname is None:
+            self.surfaces.clear()
+            self.strips.clear()
+            if self.atlas is not None:
+                self.atlas.clear()
+            self.missing.clear()
+            self.pending.clear()
+            self.pending_strips.clear()
+            return
+        self.surfaces = {k: v for k, v in self.surfaces.items() if k[0] != fname}
+        self.strips = {k: v for k, v in self.strips.items() if k[0] != fname}
+        self.pending = {k: v for k, v in self.pending.items() if k[0] != fname}
+        self.pending_strips = {k: v for k, v in self.pending_strips.items() if k[0] != fname}
+        self.missing.discard(fname)
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'surfaces': len(self.surfaces),
+            'strips': len(self.strips),
+            'pending': len(self.pending) + len(self.pending_strips),
+            'atlas_pages': len(self.atlas.pages) if self.atlas is not None else 0,
+        }
+
+# Instância única usada por todo o jogo
+ASSETS = AssetCache()
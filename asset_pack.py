@@ -0,0 +1,202 @@
+"""Pacote de imagens já escaladas para a resolução atual.
+
+Uso (gera o pacote sem abrir o jogo):
+    python asset_pack.py --resolution 2400x1080
+
+O arquivo tem um cabeçalho JSON (versão, resolução, data de cada PNG de
+origem e onde fica cada imagem) seguido dos pixels crus. Na abertura do
+jogo ele é mapeado em memória (mmap): cada imagem vira uma superfície
+direto dos bytes, sem decodificar PNG nem escalar.
+"""
+import os
+import sys
+import json
+import mmap
+import struct
+import tempfile
+import argparse
+
+import pygame
+
+GAME_FOLDER = os.path.dirname(__file__)
+ASSETS_FOLDER = os.path.join(GAME_FOLDER, 'assets')
+PACK_FOLDER = os.path.join(GAME_FOLDER, 'cache')
+# Mude quando o formato do arquivo mudar
+PACK_VERSION = 1
+MAGIC = b'SPAK'
+
+def pack_path(width, height):
+    return os.path.join(PACK_FOLDER, f'assets_{width}x{height}.pack')
+
+class AssetPack:
+    """Imagens prontas guardadas por chave do AssetCache.
+
+    Uma entrada só vale se o PNG de origem ainda tem a mesma data de
+    modificação; se não, `get` devolve None e o cache lê o PNG de novo.
+    """
+    def __init__(self, path, resolution, folder=ASSETS_FOLDER):
+        self.path = path
+        self.resolution = list(resolution)
+        self.folder = folder
+        self.entries = {}
+        self.sources = {}
+        self.data = None
+        self._file = None
+        self._mm = None
+        self.open()
+
+    def source_mtime(self, fname):
+        try:
+            return os.path.getmtime(os.path.join(self.folder, fname))
+        except OSError:
+            return None
+
+    def open(self):
+        self.close()
+        try:
+            f = open(self.path, 'rb')
+        except OSError:
+            return
+        try:
+            if f.read(4) != MAGIC:
+                raise ValueError("arquivo não é um pacote")
+            header_len = struct.unpack('<I', f.read(4))[0]
+            header = json.loads(f.read(header_len))
+            if header.get('version') != PACK_VERSION or header.get('resolution') != self.resolution:
+                raise ValueError("versão ou resolução diferente")
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Pacote de imagens ignorado ({self.path}): {e}")
+            f.close()
+            return
+        self._file = f
+        self._mm = mm
+        self.data = memoryview(mm)[8 + header_len:]
+        self.sources = header['sources']
+        # Descarta o que veio de um PNG que mudou desde o pacote
+        self.entries = {key: frames for key, frames in header['entries'].items()
+                        if self.source_mtime(frames[0][0]) == self.sources.get(frames[0][0])}
+
+    def close(self):
+        if self.data is not None:
+            self.data.release()
+            self._mm.close()
+            self._file.close()
+        self.data = self._file = self._mm = None
+        self.entries = {}
+        self.sources = {}
+
+    def __contains__(self, key):
+        return repr(key) in self.entries
+
+    def _surface(self, frame):
+        fname, offset, w, h, fmt = frame
+        size = w * h * len(fmt)
+        return pygame.image.frombuffer(self.data[offset:offset + size], (w, h), fmt)
+
+    def get(self, key):
+        """Superfície (ainda sem convert) da chave, ou None se não estiver no pacote."""
+        frames = self.entries.get(repr(key))
+        if frames is None:
+            return None
+        return self._surface(frames[0])
+
+    def get_frames(self, key):
+        frames = self.entries.get(repr(key))
+        if frames is None:
+            return None
+        return [self._surface(frame) for frame in frames]
+
+    def write(self, surfaces, strips):
+        """Regrava o pacote com as imagens do cache mais as que já estavam nele."""
+        items = []
+        for key, surf in surfaces.items():
+            fname, size, flip, alpha = key
+            # Imagens sem escala são enormes e as espelhadas saem das normais
+            if size is None or flip:
+                continue
+            items.append((repr(key), fname, [surf], alpha))
+        for key, frames in strips.items():
+            # Faixas de chão (uma Surface só) são montadas na hora
+            if isinstance(frames, list):
+                items.append((repr(key), key[0], frames, key[3]))
+
+        entries = {}
+        sources = {}
+        chunks = []
+        offset = 0
+        for key, fname, frames, alpha in items:
+            fmt = 'RGBA' if alpha else 'RGB'
+            entry = []
+            for surf in frames:
+                raw = pygame.image.tobytes(surf, fmt)
+                entry.append([fname, offset, surf.get_width(), surf.get_height(), fmt])
+                chunks.append(raw)
+                offset += len(raw)
+            entries[key] = entry
+            sources[fname] = self.source_mtime(fname)
+        # Mantém as entradas válidas que não estão carregadas nesta sessão
+        for key, frames in self.entries.items():
+            if key in entries:
+                continue
+            entry = []
+            for fname, old_offset, w, h, fmt in frames:
+                size = w * h * len(fmt)
+                chunks.append(bytes(self.data[old_offset:old_offset + size]))
+                entry.append([fname, offset, w, h, fmt])
+                offset += size
+                sources[fname] = self.sources[fname]
+            entries[key] = entry
+
+        header = json.dumps({
+            'version': PACK_VERSION,
+            'resolution': self.resolution,
+            'sources': sources,
+            'entries': entries,
+        }).encode()
+        tmp = None
+        try:
+            folder = os.path.dirname(self.path)
+            os.makedirs(folder, exist_ok=True)
+            # Um temporário por escritor: processos gravando ao mesmo tempo
+            # (playtest com vários workers) não pisam no arquivo um do outro
+            fd, tmp = tempfile.mkstemp(dir=folder, prefix=os.path.basename(self.path) + '.', suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(MAGIC)
+                f.write(struct.pack('<I', len(header)))
+                f.write(header)
+                for raw in chunks:
+                    f.write(raw)
+            self.close()
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Erro ao salvar pacote de imagens: {e}")
+            if tmp is not None and os.path.exists(tmp):
+                os.remove(tmp)
+            return 0
+        self.open()
+        return len(entries)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera o pacote de imagens escaladas para uma resolução")
+    parser.add_argument('--resolution', default='800x450', help='LARGURAxALTURA lógica do aparelho')
+    parser.add_argument('--levels', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    # Resolução fixa sem abrir janela; precisa vir antes de importar o jogo
+    os.environ.setdefault('SUPERPUG_HEADLESS', '1')
+    os.environ['SUPERPUG_RESOLUTION'] = args.resolution
+    from main import Game
+    from asset_cache import ASSETS
+
+    game = Game()
+    for level in range(1, args.levels + 1):
+        game.level = level
+        game.game_mode = 'mission'
+        game.new_game()
+    ASSETS.collect()
+    count = ASSETS.bake()
+    print(f"{count} imagens em {ASSETS.pack.path}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
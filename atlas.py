@@ -0,0 +1,74 @@
+import pygame
+
+# Tamanho (px) de cada página do atlas em 800x450; o jogo multiplica pelo SCALE
+ATLAS_PAGE = 512
+# Espaço vazio entre imagens, para a escala/filtro de uma não puxar pixels da vizinha
+ATLAS_PADDING = 1
+
+class Atlas:
+    """Junta imagens pequenas com transparência em poucas superfícies grandes.
+
+    Empacota em prateleiras: as imagens são postas lado a lado numa faixa
+    da altura da maior delas; quando a faixa enche, abre outra embaixo e,
+    quando a página enche, abre outra página. `add` devolve uma subsurface
+    da página, que se desenha como qualquer superfície.
+    """
+    def __init__(self, page_size=ATLAS_PAGE, padding=ATLAS_PADDING):
+        self.page_size = page_size
+        self.padding = padding
+        self.pages = []
+        # Prateleira atual da última página: (y do topo, altura, próximo x)
+        self.shelf_y = 0
+        self.shelf_h = 0
+        self.shelf_x = 0
+        self.used = 0
+
+    def fits(self, surf):
+        w, h = surf.get_size()
+        return w + self.padding <= self.page_size and h + self.padding <= self.page_size
+
+    def _new_page(self):
+        page = pygame.Surface((self.page_size, self.page_size), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            # Mesmo formato da tela: o blit não precisa converter pixel a pixel
+            page = page.convert_alpha()
+        page.fill((0, 0, 0, 0))
+        self.pages.append(page)
+        self.shelf_y = self.shelf_h = self.shelf_x = 0
+
+    def _place(self, w, h):
+        pad = self.padding
+        if not self.pages:
+            self._new_page()
+        if self.shelf_x + w > self.page_size:
+            # Faixa cheia: começa outra embaixo
+            self.shelf_y += self.shelf_h + pad
+            self.shelf_x = self.shelf_h = 0
+        if self.shelf_y + h > self.page_size:
+            self._new_page()
+        pos = (self.shelf_x, self.shelf_y)
+        self.shelf_x += w + pad
+        self.shelf_h = max(self.shelf_h, h)
+        return pos
+
+    def add(self, surf):
+        """Copia `surf` para o atlas e devolve a subsurface equivalente."""
+        w, h = surf.get_size()
+        x, y = self._place(w, h)
+        page = self.pages[-1]
+        # Soma em cima de pixels zerados = cópia exata, inclusive do alpha
+        page.blit(surf, (x, y), special_flags=pygame.BLEND_RGBA_ADD)
+        self.used += w * h
+        return page.subsurface((x, y, w, h))
+
+    def clear(self):
+        self.pages = []
+        self.shelf_y = self.shelf_h = self.shelf_x = 0
+        self.used = 0
+
+    def stats(self):
+        area = len(self.pages) * self.page_size * self.page_size
+        return {
+            'pages': len(self.pages),
+            'fill': self.used / area if area else 0.0,
+        }
@@ -0,0 +1,121 @@
+"""Benchmark headless: roda N frames de uma fase sem tela e sem limite de FPS.
+
+Uso:
+    python bench.py --frames 3000 --level 2 --seed 42 --script run-jump --render
+    python bench.py --render --profile trace.csv
+    python bench.py --replay cache/replays/f1_s42_1700000000.sprp --render
+
+Mostra quantos passos de simulação por segundo o Game.update aguenta e o
+tempo médio de cada fase (entrada, update, draw).
+"""
+import os
+import sys
+import time
+import random
+import argparse
+from collections import deque
+
+# Precisa vir antes de importar settings (que inicializa o pygame)
+os.environ.setdefault('SUPERPUG_HEADLESS', '1')
+
+import pygame
+from main import Game
+from profiler import PROFILER
+
+# --- ENTRADAS ROTEIRIZADAS ---
+# Cada roteiro recebe o número do frame e devolve (esq, dir, pulo, tiro)
+SCRIPTS = {
+    'idle': lambda f: (False, False, False, False),
+    'run': lambda f: (False, True, False, False),
+    'run-jump': lambda f: (False, True, f % 40 == 0, False),
+    'run-jump-fire': lambda f: (False, True, f % 40 == 0, True),
+    'zigzag': lambda f: ((f // 90) % 2 == 1, (f // 90) % 2 == 0, f % 30 == 0, True),
+}
+
+def run_benchmark(frames, level=1, seed=0, script='run-jump-fire', render=False, profile=None):
+    game = Game()
+    game.game_mode = 'mission'
+    game.level = level
+    game.level_seeds[level] = seed
+    random.seed(seed)
+    game.new_game()
+
+    # Com --profile, o medidor por fase do jogo também grava cada frame
+    if profile and not PROFILER.enabled:
+        PROFILER.toggle()
+    PROFILER.frames = deque(maxlen=frames)
+    get_input = SCRIPTS[script]
+    timings = {'input': 0.0, 'update': 0.0, 'draw': 0.0}
+    restarts = 0
+    clock = time.perf_counter
+
+    start = clock()
+    for frame in range(frames):
+        t0 = clock()
+        PROFILER.begin_frame()
+        pygame.event.pump()
+        game.apply_input(*get_input(frame))
+        PROFILER.lap('events')
+        t1 = clock()
+        game.update()
+        t2 = clock()
+        if render:
+            game.draw()
+        t3 = clock()
+        if PROFILER.enabled:
+            game.profile_counts()
+            PROFILER.end_frame()
+
+        timings['input'] += t1 - t0
+        timings['update'] += t2 - t1
+        timings['draw'] += t3 - t2
+
+        # Morreu ou terminou a fase: volta ao início da mesma fase (sem recriá-la)
+        if game.state != 'PLAYING':
+            restarts += 1
+            game.quick_retry()
+    elapsed = clock() - start
+    if profile:
+        PROFILER.export(profile)
+
+    return {
+        'frames': frames,
+        'level': level,
+        'seed': seed,
+        'script': script,
+        'render': render,
+        'restarts': restarts,
+        'seconds': elapsed,
+        'steps_per_second': frames / elapsed if elapsed else 0.0,
+        'phase_ms': {k: v * 1000 / frames for k, v in timings.items()},
+        'pools': game.pool_stats(),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=3000)
+    parser.add_argument('--level', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--script', choices=sorted(SCRIPTS), default='run-jump-fire')
+    parser.add_argument('--render', action='store_true', help='desenha cada frame numa superfície fora da tela')
+    parser.add_argument('--profile', metavar='ARQUIVO', help='salva o tempo de cada fase por frame (.csv ou .json)')
+    parser.add_argument('--replay', metavar='ARQUIVO', help='em vez de um roteiro, reproduz uma partida gravada')
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        # Mesmas entradas, passo a passo: compara versões do jogo na mesma partida
+        from replay import main as replay_main
+        return replay_main([args.replay] + (['--render'] if args.render else []))
+
+    result = run_benchmark(args.frames, args.level, args.seed, args.script, args.render, args.profile)
+    print(f"{result['frames']} frames em {result['seconds']:.2f}s "
+          f"-> {result['steps_per_second']:.0f} passos/s "
+          f"(fase {result['level']}, semente {result['seed']}, reinícios {result['restarts']})")
+    for phase, ms in result['phase_ms'].items():
+        print(f"  {phase:<7} {ms:.3f} ms/frame")
+    for name, st in result['pools'].items():
+        print(f"  pool {name}: " + ", ".join(f"{k} {v}" for k, v in st.items()))
+    return result
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,221 @@
+import pygame
+from settings import *
+from pool import SpritePool
+from weapons import Projectile
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class ArrayBullets:
+    """Tiros guardados em arrays NumPy contíguos (posição, velocidade, dano).
+
+    Todos andam com uma única conta vetorizada, os que saem da tela são
+    descartados por máscara, a colisão com os inimigos é testada em lote
+    e o desenho é um único Surface.blits. Aguenta milhares de tiros.
+    """
+    def __init__(self, camera, capacity=64):
+        self.camera = camera
+        self.n = 0
+        self.grown = 0
+        self._alloc(capacity)
+
+    def _alloc(self, capacity):
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2), np.float32)   # canto superior esquerdo
+        self.prev = np.zeros((capacity, 2), np.float32)  # posição no passo anterior
+        self.vel = np.zeros((capacity, 2), np.float32)
+        self.size = np.zeros((capacity, 2), np.int32)
+        self.damage = np.zeros(capacity, np.float32)
+        self.weapon = np.zeros(capacity, np.int32)
+        self.images = [None] * capacity
+
+    def _grow(self):
+        n = self.n
+        old = (self.pos, self.prev, self.vel, self.size, self.damage, self.weapon, self.images)
+        self._alloc(self.capacity * 2)
+        for new_arr, old_arr in zip((self.pos, self.prev, self.vel, self.size, self.damage, self.weapon), old):
+            new_arr[:n] = old_arr[:n]
+        self.images[:n] = old[-1][:n]
+        self.grown += 1
+
+    def spawn(self, x, y, vx, vy, image, damage, weapon_id):
+        if self.n == self.capacity:
+            self._grow()
+        i = self.n
+        w, h = image.get_size()
+        self.pos[i] = (x - w // 2, y - h // 2)  # como rect.center = (x, y)
+        self.prev[i] = self.pos[i]
+        self.vel[i] = (vx, vy)
+        self.size[i] = (w, h)
+        self.damage[i] = damage
+        self.weapon[i] = weapon_id
+        self.images[i] = image
+        self.n += 1
+
+    def _keep(self, keep):
+        idx = np.flatnonzero(keep)
+        m = len(idx)
+        for arr in (self.pos, self.prev, self.vel, self.size, self.damage, self.weapon):
+            arr[:m] = arr[idx]
+        images = self.images
+        images[:m] = [images[i] for i in idx]
+        images[m:self.n] = [None] * (self.n - m)
+        self.n = m
+
+    def update(self):
+        n = self.n
+        if not n:
+            return
+        self.prev[:n] = self.pos[:n]
+        self.pos[:n] += self.vel[:n]
+
+        # Some ao sair da tela (pelos lados ou por baixo)
+        view = self.camera.view
+        x = self.pos[:n, 0]
+        keep = (x + self.size[:n, 0] >= view.left) & (x <= view.right) & (self.pos[:n, 1] <= HEIGHT)
+        if not keep.all():
+            self._keep(keep)
+
+    def _overlap(self, rects):
+        # rects: array (m, 4) com x, y, w, h -> matriz (tiros x alvos)
+        n = self.n
+        bx = self.pos[:n, 0].astype(np.int32)[:, None]
+        by = self.pos[:n, 1].astype(np.int32)[:, None]
+        bw = self.size[:n, 0][:, None]
+        bh = self.size[:n, 1][:, None]
+        tx, ty, tw, th = rects[:, 0], rects[:, 1], rects[:, 2], rects[:, 3]
+        return (bx < tx + tw) & (bx + bw > tx) & (by < ty + th) & (by + bh > ty)
+
+    def collide(self, targets):
+        """Como groupcollide(alvos, tiros, False, True): {alvo: [danos]}.
+
+        Cada tiro acerta só o primeiro alvo (na ordem de `targets`) e some.
+        """
+        targets = list(targets)
+        if not self.n or not targets:
+            return {}
+        rects = np.array([tuple(t.rect) for t in targets], np.int32)
+        overlap = self._overlap(rects)
+        hit = overlap.any(axis=1)
+        if not hit.any():
+            return {}
+        first = overlap.argmax(axis=1)
+        hits = {}
+        for b in np.flatnonzero(hit):
+            hits.setdefault(targets[first[b]], []).append(float(self.damage[b]))
+        self._keep(~hit)
+        return hits
+
+    def collide_rect(self, rect):
+        """Remove os tiros que encostam em `rect` e devolve quantos eram."""
+        if not self.n:
+            return 0
+        hit = self._overlap(np.array([tuple(rect)], np.int32))[:, 0]
+        count = int(hit.sum())
+        if count:
+            self._keep(~hit)
+        return count
+
+    def draw(self, surface):
+        n = self.n
+        if not n:
+            return
+        a = self.camera.alpha
+        pos = self.prev[:n] + (self.pos[:n] - self.prev[:n]) * a
+        xs = (pos[:, 0] - self.camera.draw_x).astype(np.int32).tolist()
+        ys = pos[:, 1].astype(np.int32).tolist()
+        surface.blits(list(zip(self.images[:n], zip(xs, ys))), False)
+
+    def sprites(self):
+        # Não há sprites: a interpolação é feita pelos próprios arrays
+        return []
+
+    def clear(self):
+        self.images[:self.n] = [None] * self.n
+        self.n = 0
+
+    def state(self):
+        """Cópia dos tiros vivos (para snapshot.WorldSnapshot)."""
+        n = self.n
+        arrays = [arr[:n].copy() for arr in (self.pos, self.prev, self.vel, self.size, self.damage, self.weapon)]
+        return n, arrays, self.images[:n]
+
+    def restore(self, state):
+        n, arrays, images = state
+        self.clear()
+        while self.capacity < n:
+            self._grow()
+        for arr, saved in zip((self.pos, self.prev, self.vel, self.size, self.damage, self.weapon), arrays):
+            arr[:n] = saved
+        self.images[:n] = images
+        self.n = n
+
+    def stats(self):
+        return {'array': {'capacity': self.capacity, 'grown': self.grown, 'live': self.n}}
+
+    def __len__(self):
+        return self.n
+
+class SpriteBullets:
+    """Mesma interface de ArrayBullets usando sprites (sem NumPy).
+
+    Cada tiro é um Projectile reaproveitado por um pool por arma.
+    """
+    def __init__(self, camera, cap=POOL_CAPS['bullet']):
+        self.camera = camera
+        self.cap = cap
+        self.group = pygame.sprite.Group()
+        self.pools = {}
+
+    def spawn(self, x, y, vx, vy, image, damage, weapon_id):
+        pool = self.pools.get(weapon_id)
+        if pool is None:
+            pool = self.pools[weapon_id] = SpritePool(Projectile, self.cap)
+        self.group.add(pool.acquire(x, y, vx, vy, image, damage, self.camera))
+
+    def update(self):
+        self.group.update()
+
+    def collide(self, targets):
+        hits = pygame.sprite.groupcollide(targets, self.group, False, True)
+        return {target: [b.damage for b in bullets] for target, bullets in hits.items()}
+
+    def collide_rect(self, rect):
+        hits = [b for b in self.group if rect.colliderect(b.rect)]
+        for b in hits:
+            b.kill()
+        return len(hits)
+
+    def draw(self, surface):
+        self.camera.draw(self.group, surface)
+
+    def sprites(self):
+        return self.group.sprites()
+
+    def clear(self):
+        for b in self.group.sprites():
+            b.kill()
+
+    def state(self):
+        return [(b.pool, b.rect.center, b.vx, b.vy, b.image, b.damage) for b in self.group]
+
+    def restore(self, state):
+        self.clear()
+        for pool, (x, y), vx, vy, image, damage in state:
+            self.group.add(pool.acquire(x, y, vx, vy, image, damage, self.camera))
+
+    def stats(self):
+        return {weapon_id: pool.stats() for weapon_id, pool in self.pools.items()}
+
+    def __len__(self):
+        return len(self.group)
+
+def make_bullets(camera):
+    """ArrayBullets se houver NumPy (ou conforme BULLET_BACKEND), senão sprites."""
+    if BULLET_BACKEND == 'sprites' or (np is None and BULLET_BACKEND == 'auto'):
+        return SpriteBullets(camera)
+    if np is None:
+        raise ImportError("BULLET_BACKEND='numpy' requer o pacote numpy")
+    return ArrayBullets(camera)
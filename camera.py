@@ -0,0 +1,83 @@
+import pygame
+from settings import *
+
+class Camera:
+    """Guarda o deslocamento da tela sobre o mundo.
+
+    Os sprites ficam sempre em coordenadas do mundo; o deslocamento só é
+    aplicado na hora de desenhar (ou para converter um toque na tela).
+    """
+    def __init__(self, width=WIDTH, height=HEIGHT):
+        self.width = width
+        self.height = height
+        self.x = 0
+        # Interpolação entre o passo anterior e o atual (laço de tempo fixo)
+        self.prev_x = 0
+        self.previous = {}
+        self.alpha = 1.0
+        # A câmera anda quando o jogador passa deste ponto da tela
+        self.follow_line = width * 0.4
+
+    def reset(self):
+        self.x = 0
+        self.prev_x = 0
+        self.previous = {}
+        self.alpha = 1.0
+
+    def begin_step(self, sprites):
+        """Guarda onde a câmera e os sprites móveis estavam antes do passo."""
+        self.prev_x = self.x
+        self.previous = {s: s.rect.topleft for s in sprites}
+
+    def set_alpha(self, alpha):
+        # 0.0 = desenha no passo anterior, 1.0 = no passo atual
+        self.alpha = alpha
+
+    @property
+    def offset(self):
+        return int(self.x)
+
+    @property
+    def view(self):
+        return pygame.Rect(self.offset, 0, self.width, self.height)
+
+    def follow(self, rect):
+        """Avança a câmera se o alvo passou da linha. Devolve o quanto andou."""
+        limit = self.x + self.follow_line
+        if rect.right >= limit:
+            scroll = rect.right - limit
+            self.x += scroll
+            return scroll
+        return 0
+
+    def apply(self, rect):
+        return rect.move(-self.offset, 0)
+
+    def to_screen(self, x, y):
+        return (x - self.offset, y)
+
+    def to_world(self, x, y):
+        return (x + self.offset, y)
+
+    @property
+    def draw_x(self):
+        # Posição da câmera interpolada para o desenho
+        return self.prev_x + (self.x - self.prev_x) * self.alpha
+
+    def screen_pos(self, sprite):
+        """Posição de desenho do sprite, interpolada entre os dois passos."""
+        a = self.alpha
+        ox = self.draw_x
+        x, y = sprite.rect.topleft
+        prev = self.previous.get(sprite)
+        if prev is not None:
+            x = prev[0] + (x - prev[0]) * a
+            y = prev[1] + (y - prev[1]) * a
+        return (int(x - ox), int(y))
+
+    def draw(self, sprites, surface):
+        if self.alpha == 1.0:
+            ox = self.offset
+            surface.blits([(s.image, (s.rect.x - ox, s.rect.y)) for s in sprites], False)
+        else:
+            surface.blits([(s.image, self.screen_pos(s)) for s in sprites], False)
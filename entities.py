@@ -0,0 +1,294 @@
+import pygame
+import math
+import random
+from settings import *
+from sim_clock import SIM_CLOCK
+from sprites import Enemy, Pigeon, Bone
+from weapons import PIGEON_DROPPING
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def _rect_round(values):
+    # Mesmo arredondamento do pygame.Rect ao receber float (metade se afasta do zero)
+    return np.copysign(np.floor(np.abs(values) + 0.5), values)
+
+class EntityBatch(pygame.sprite.Group):
+    """Grupo que guarda o estado dos seus sprites em arrays (struct-of-arrays).
+
+    Quem está no lote não roda `update()` próprio: `step()` atualiza todos
+    de uma vez com NumPy e só os rects dos que aparecem na tela são
+    copiados de volta para os sprites. Ao sair do lote (dormir ou morrer)
+    o sprite recebe o estado final, então pode voltar depois.
+    """
+    FIELDS = ('x', 'y')
+
+    def __init__(self, game, capacity=32):
+        self.game = game
+        self.members = []
+        self.slots = {}
+        self.capacity = capacity
+        self.a = {name: np.zeros(capacity) for name in self.FIELDS}
+        self.was_visible = np.zeros(capacity, bool)
+        super().__init__()
+
+    def accepts(self, sprite):
+        return True
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite)
+        if sprite in self.slots:
+            return
+        i = len(self.members)
+        if i == self.capacity:
+            self.capacity *= 2
+            for name, arr in self.a.items():
+                self.a[name] = np.resize(arr, self.capacity)
+            self.was_visible = np.resize(self.was_visible, self.capacity)
+        self.members.append(sprite)
+        self.slots[sprite] = i
+        self.load(i, sprite)
+        self.was_visible[i] = False
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        i = self.slots.pop(sprite, None)
+        if i is None:
+            return
+        self.store(i, sprite)
+        last = len(self.members) - 1
+        if i != last:
+            # Tira do meio trazendo o último para o lugar
+            for arr in self.a.values():
+                arr[i] = arr[last]
+            self.was_visible[i] = self.was_visible[last]
+            moved = self.members[last]
+            self.members[i] = moved
+            self.slots[moved] = i
+        self.members.pop()
+
+    def load(self, i, sprite):
+        self.a['x'][i] = sprite.rect.x
+        self.a['y'][i] = sprite.rect.y
+
+    def store(self, i, sprite):
+        sprite.rect.x = int(self.a['x'][i])
+        sprite.rect.y = int(self.a['y'][i])
+
+    def step(self):
+        pass
+
+    def flush(self):
+        """Copia o estado de todos os membros para os sprites (não só os visíveis)."""
+        for i, sprite in enumerate(self.members):
+            self.store(i, sprite)
+
+    def kill_where(self, mask):
+        # Do maior índice para o menor, por causa da troca com o último
+        for i in np.flatnonzero(mask)[::-1]:
+            self.members[i].kill()
+
+    def sync(self, widths):
+        """Copia o estado para os sprites visíveis (e os que acabaram de sair)."""
+        n = len(self.members)
+        if not n:
+            return
+        view = self.game.camera.view
+        x = self.a['x'][:n]
+        # O x vai para todos: a região ativa decide quem dorme pelo rect, e um
+        # rect velho fazia uma pomba que voltou para a tela parar de ser atualizada
+        for sprite, rect_x in zip(self.members, x.astype(int).tolist()):
+            sprite.rect.x = rect_x
+        visible = (x + widths >= view.left) & (x <= view.right)
+        for i in np.flatnonzero(visible | self.was_visible[:n]):
+            self.store(i, self.members[i])
+        self.was_visible[:n] = visible
+
+class WalkerBatch(EntityBatch):
+    """Gato, vaca e caranguejo: andam na própria plataforma com gravidade."""
+    FIELDS = ('x', 'y', 'w', 'h', 'vel_y', 'speed', 'direction', 'resting',
+              'plat_left', 'plat_right', 'plat_top', 'plat_bottom')
+
+    def accepts(self, sprite):
+        return isinstance(sprite, Enemy) and sprite.type != 'guarda_chuva' and sprite.platform is not None
+
+    def load(self, i, sprite):
+        a = self.a
+        a['x'][i], a['y'][i] = sprite.rect.topleft
+        a['w'][i], a['h'][i] = sprite.rect.size
+        a['vel_y'][i] = sprite.vel_y
+        a['speed'][i] = sprite.speed
+        a['direction'][i] = sprite.direction
+        a['resting'][i] = sprite.resting
+        plat = sprite.platform.rect
+        a['plat_left'][i], a['plat_right'][i] = plat.left, plat.right
+        a['plat_top'][i], a['plat_bottom'][i] = plat.top, plat.bottom
+
+    def store(self, i, sprite):
+        a = self.a
+        sprite.rect.x = int(a['x'][i])
+        sprite.rect.y = int(a['y'][i])
+        sprite.vel_y = float(a['vel_y'][i])
+        sprite.direction = int(a['direction'][i])
+        sprite.resting = bool(a['resting'][i])
+        sprite.image = sprite.image_right if sprite.direction == 1 else sprite.image_left
+
+    def step(self):
+        n = len(self.members)
+        if not n:
+            return
+        a = {name: arr[:n] for name, arr in self.a.items()}
+        x, y, w, h = a['x'], a['y'], a['w'], a['h']
+
+        # Anda e vira nas bordas da plataforma
+        x[:] = _rect_round(x + a['speed'] * a['direction'])
+        left = x < a['plat_left']
+        x[left] = a['plat_left'][left]
+        a['direction'][left] = 1
+        right = x + w > a['plat_right']
+        x[right] = a['plat_right'][right] - w[right]
+        a['direction'][right] = -1
+
+        # Gravidade e pouso na própria plataforma, só para quem ainda não assentou
+        falling = a['resting'] == 0
+        if falling.any():
+            vel_y = a['vel_y']
+            vel_y[falling] += GRAVITY
+            y[falling] = _rect_round(y[falling] + vel_y[falling])
+            landed = falling & (vel_y > 0) & (y < a['plat_bottom']) & (y + h > a['plat_top'])
+            y[landed] = a['plat_top'][landed] - h[landed]
+            vel_y[landed] = 0
+            a['resting'][landed] = 1
+
+            fell = y > HEIGHT
+            if fell.any():
+                self.kill_where(fell)
+        self.sync(self.a['w'][:len(self.members)])
+
+class FloaterBatch(EntityBatch):
+    """Guarda-chuva: voa reto tremendo para cima e para baixo."""
+    FIELDS = ('x', 'y', 'w', 'speed', 'direction')
+
+    def __init__(self, game, capacity=32):
+        super().__init__(game, capacity)
+        # Sorteios vetorizados, mas ainda presos à semente global do jogo
+        self.rng = np.random.default_rng(random.getrandbits(32))
+
+    def accepts(self, sprite):
+        return isinstance(sprite, Enemy) and sprite.type == 'guarda_chuva'
+
+    def load(self, i, sprite):
+        a = self.a
+        a['x'][i], a['y'][i] = sprite.rect.topleft
+        a['w'][i] = sprite.rect.width
+        a['speed'][i] = sprite.speed
+        a['direction'][i] = sprite.direction
+
+    def store(self, i, sprite):
+        super().store(i, sprite)
+        sprite.image = sprite.image_right if sprite.direction == 1 else sprite.image_left
+
+    def step(self):
+        n = len(self.members)
+        if not n:
+            return
+        x, y = self.a['x'][:n], self.a['y'][:n]
+        x[:] = _rect_round(x + self.a['speed'][:n] * self.a['direction'][:n])
+        y += self.rng.choice((-2, 2), n)
+        fell = y > HEIGHT
+        if fell.any():
+            self.kill_where(fell)
+        self.sync(self.a['w'][:len(self.members)])
+
+class PigeonBatch(EntityBatch):
+    """Pombas: voam de um lado a outro da tela e soltam caca de vez em quando."""
+    FIELDS = ('x', 'y', 'w', 'h', 'speed', 'direction', 'last_shot', 'shot_delay')
+
+    def __init__(self, game, capacity=16):
+        super().__init__(game, capacity)
+        self.rng = np.random.default_rng(random.getrandbits(32))
+
+    def accepts(self, sprite):
+        return isinstance(sprite, Pigeon)
+
+    def load(self, i, sprite):
+        a = self.a
+        a['x'][i], a['y'][i] = sprite.rect.topleft
+        a['w'][i], a['h'][i] = sprite.rect.size
+        a['speed'][i] = sprite.speed
+        a['direction'][i] = sprite.direction
+        a['last_shot'][i] = sprite.last_shot
+        a['shot_delay'][i] = sprite.shot_delay
+
+    def store(self, i, sprite):
+        super().store(i, sprite)
+        sprite.direction = int(self.a['direction'][i])
+        sprite.last_shot = int(self.a['last_shot'][i])
+        sprite.image = sprite.image_flipped if sprite.direction == 1 else sprite.image_orig
+
+    def step(self):
+        n = len(self.members)
+        if not n:
+            return
+        a = {name: arr[:n] for name, arr in self.a.items()}
+        x, y, w = a['x'], a['y'], a['w']
+        view = self.game.camera.view
+
+        x[:] = _rect_round(x + a['speed'] * a['direction'])
+        a['direction'][x + w < view.left] = 1
+        a['direction'][x > view.right + 100] = -1
+        y[:] = _rect_round(y + math.sin(SIM_CLOCK.ticks * 0.005) * 2)
+
+        # Tiros: quem está na tela e com o tempo de recarga vencido
+        now = SIM_CLOCK.ticks
+        centerx = x + w // 2
+        ready = (view.left < centerx) & (centerx < view.right) & (now - a['last_shot'] > a['shot_delay'])
+        if ready.any():
+            a['last_shot'][ready] = now
+            drop = PIGEON_DROPPING
+            for i in np.flatnonzero(ready)[self.rng.random(int(ready.sum())) > 0.3]:
+                self.game.bullets_enemy.spawn(int(centerx[i]), int(y[i] + a['h'][i]), 0, drop.speed,
+                                              drop.image_right, drop.damage, drop.index)
+        self.sync(w)
+
+class BoneBatch(EntityBatch):
+    """Ossinhos: só flutuam em volta da altura inicial."""
+    FIELDS = ('x', 'y', 'w', 'y_start', 'phase')
+
+    def accepts(self, sprite):
+        return isinstance(sprite, Bone)
+
+    def load(self, i, sprite):
+        a = self.a
+        a['x'][i], a['y'][i] = sprite.rect.topleft
+        a['w'][i] = sprite.rect.width
+        a['y_start'][i] = sprite.y_start
+        a['phase'][i] = sprite.float_offset
+
+    def store(self, i, sprite):
+        super().store(i, sprite)
+        sprite.float_offset = float(self.a['phase'][i])
+
+    def step(self):
+        n = len(self.members)
+        if not n:
+            return
+        phase = self.a['phase'][:n]
+        phase += 0.1
+        self.a['y'][:n] = self.a['y_start'][:n] + np.trunc(5 * np.sin(phase))
+        self.sync(self.a['w'][:n])
+
+def make_batches(game):
+    """Lotes vetorizados (inimigos por tipo + ossos) ou [] sem NumPy."""
+    if ENTITY_BACKEND == 'sprites' or (np is None and ENTITY_BACKEND == 'auto'):
+        return []
+    if np is None:
+        raise ImportError("ENTITY_BACKEND='numpy' requer o pacote numpy")
+    return [
+        (game.enemies, WalkerBatch(game)),
+        (game.enemies, FloaterBatch(game)),
+        (game.enemies, PigeonBatch(game)),
+        (game.bones, BoneBatch(game)),
+    ]
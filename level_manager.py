@@ -1,100 +1,317 @@
 import pygame
+import os
+import json
 import random
+from collections import deque
 from settings import *
-from sprites import Platform, Enemy, Bone, Flag, Pigeon
+from sprites import Platform, Enemy, Bone, Flag, Pigeon, enemy_size
+from asset_cache import ASSETS, GAME_FOLDER
+
+# Layouts gerados ficam salvos aqui, um arquivo por (semente, fase, resolução)
+LEVEL_CACHE_FOLDER = os.path.join(GAME_FOLDER, 'cache', 'levels')
+# Mude quando o formato ou o gerador mudar, para invalidar o cache
+LAYOUT_VERSION = 1
+# Quantos layouts ficam no disco; cada partida sorteia uma semente nova,
+# então os usados há mais tempo são apagados
+LEVEL_CACHE_LIMIT = 64
 
 class LevelManager:
     def __init__(self, game):
         self.game = game
+        self.layouts = {}
+
+    def add(self, sprite, group):
+        # Todo sprite da fase começa dormindo na região ativa
+        self.game.all_sprites.add(sprite)
+        group.add(sprite)
+        self.game.region.add(sprite)
 
-    def create_level(self, difficulty):
-        # 1. Escolha da textura do chão
-        ground_img = 'chao.png'
+    def ground_texture(self, difficulty):
         if difficulty == 2:
-            ground_img = 'chao2.png'
-        elif difficulty >= 3:
-            ground_img = 'chao.png'
+            return 'chao2.png'
+        return 'chao.png'
+
+    def asset_specs(self, difficulty):
+        tile_size = int(50 * SCALE)
+        specs = [
+            (self.ground_texture(difficulty), (tile_size, tile_size)),
+            ('ossinho.png', (int(15 * SCALE), int(15 * SCALE))),
+            ('bandeira.png', (int(60 * SCALE), int(80 * SCALE))),
+            ('pomba.png', (int(60 * SCALE), int(40 * SCALE))),
+        ]
+        for enemy_type in ('gato', 'vaca', 'caranguejo', 'guarda_chuva'):
+            specs.append((f'{enemy_type}.png', enemy_size(enemy_type)))
+        return specs
+
+    def prefetch_assets(self, difficulty):
+        """Adianta em segundo plano o fundo e as imagens de uma fase futura."""
+        ASSETS.prefetch(self.asset_specs(difficulty))
+        ASSETS.prefetch_strip(f'fundo{difficulty}.png', count=3, alpha=False, height=HEIGHT)
+
+    def preload_assets(self, difficulty):
+        # Carrega tudo que a fase usa antes de criar os sprites,
+        # assim nem a fase nem a primeira explosão travam o jogo
+        ASSETS.preload(self.asset_specs(difficulty))
+        try:
+            ASSETS.get_strip('explosao_strip.png', (int(80 * SCALE), int(80 * SCALE)))
+        except Exception as e:
+            print(f"Erro ao carregar explosão: {e}")
+
+    def new_layout(self, difficulty, seed):
+        return {
+            'version': LAYOUT_VERSION,
+            'seed': seed,
+            'difficulty': difficulty,
+            'resolution': [WIDTH, HEIGHT],
+            # 1. Escolha da textura do chão
+            'ground': self.ground_texture(difficulty),
+            'platforms': [],  # [x, y, w, h]
+            'bones': [],      # [x, y]
+            'enemies': [],    # [tipo, x, y, índice da plataforma]
+            'flag': None,     # [x, y]
+        }
+
+    def generate_segment(self, rng, layout, current_x, difficulty):
+        """Acrescenta ao layout um vão + plataforma (com ossos e inimigo).
+
+        `difficulty` pode ser fracionária (modo infinito); com valores
+        inteiros gera exatamente as fases da campanha. Devolve o novo x.
+        """
+        ground_y = HEIGHT - int(60 * SCALE)
+        platforms = layout['platforms']
+
+        min_gap = int(50 * SCALE) + int(difficulty * 5)
+        max_gap = int(120 * SCALE) + int(difficulty * 15) 
+        if max_gap > 300 * SCALE: max_gap = int(300 * SCALE)
+
+        # --- GERA PLATAFORMA ---
+        gap = rng.randint(min_gap, max_gap)
+        current_x += gap
+        plat_w = rng.randint(int(200 * SCALE), int(500 * SCALE))
+        
+        if rng.random() > 0.3:
+            plat_y = ground_y
+        else:
+            height_variance = int(int(50 * SCALE) * difficulty)
+            if height_variance > 250 * SCALE: height_variance = int(250 * SCALE)
+            plat_y = ground_y - rng.randint(int(50*SCALE), height_variance)
+        
+        plat_idx = len(platforms)
+        platforms.append([current_x, plat_y, plat_w, int(60 * SCALE)])
+        
+        # --- GERA OSSOS ---
+        if rng.random() > 0.5:
+            num_bones = rng.randint(1, 3)
+            start_bone_x = current_x + int(50*SCALE)
+            for b in range(num_bones):
+                bx = start_bone_x + (b * int(50*SCALE))
+                if bx < current_x + plat_w - int(50*SCALE): 
+                    layout['bones'].append([bx, plat_y])
+
+        # --- GERA INIMIGOS ---
+        if rng.random() > 0.4:
+            ex = current_x + plat_w // 2
+            ey = plat_y - int(150 * SCALE)
+            
+            # Inimigos da Fase 1
+            if difficulty < 2:
+                enemy_type = rng.choice(['gato', 'vaca', 'guarda_chuva'])
+                layout['enemies'].append([enemy_type, ex, ey, plat_idx])
             
+            # Inimigos da Fase 2+ (Adicionado Caranguejo)
+            else:
+                rnd = rng.random()
+                if rnd < 0.4:
+                    # Gatos e Caranguejos no chão
+                    enemy_type = rng.choice(['gato', 'caranguejo']) 
+                    layout['enemies'].append([enemy_type, ex, ey, plat_idx])
+                else:
+                    # Pombas no ar
+                    py = rng.randint(int(50*SCALE), int(200*SCALE))
+                    px = current_x + rng.randint(0, plat_w)
+                    layout['enemies'].append(['pomba', px, py, plat_idx])
+
+        return current_x + plat_w
+
+    def generate_layout(self, difficulty, seed):
+        """Gera a descrição da fase (sem criar sprites).
+
+        Usa só o próprio gerador com a semente, então a mesma
+        (semente, dificuldade, resolução) sempre gera a mesma fase.
+        """
+        rng = random.Random(seed)
         ground_y = HEIGHT - int(60 * SCALE)
+        layout = self.new_layout(difficulty, seed)
         
         # 2. Chão inicial
-        p = Platform(0, ground_y, int(WIDTH * 1.5), int(60 * SCALE), texture_name=ground_img)
-        self.game.all_sprites.add(p)
-        self.game.platforms.add(p)
-        
+        layout['platforms'].append([0, ground_y, int(WIDTH * 1.5), int(60 * SCALE)])
         current_x = int(WIDTH * 1.5)
-        
-        min_gap = int(50 * SCALE) + (difficulty * 5)
-        max_gap = int(120 * SCALE) + (difficulty * 15) 
-        if max_gap > 300 * SCALE: max_gap = 300 * SCALE
 
         segments = 15 + (difficulty * 2) 
-        
         for i in range(segments):
-            # --- GERA PLATAFORMA ---
-            gap = random.randint(min_gap, max_gap)
-            current_x += gap
-            plat_w = random.randint(int(200 * SCALE), int(500 * SCALE))
-            
-            if random.random() > 0.3:
-                plat_y = ground_y
-            else:
-                height_variance = int(50 * SCALE) * difficulty
-                if height_variance > 250 * SCALE: height_variance = 250 * SCALE
-                plat_y = ground_y - random.randint(int(50*SCALE), height_variance)
-            
-            p = Platform(current_x, plat_y, plat_w, int(60 * SCALE), texture_name=ground_img)
-            self.game.all_sprites.add(p)
-            self.game.platforms.add(p)
-            
-            # --- GERA OSSOS ---
-            if random.random() > 0.5:
-                num_bones = random.randint(1, 3)
-                start_bone_x = current_x + int(50*SCALE)
-                for b in range(num_bones):
-                    bx = start_bone_x + (b * int(50*SCALE))
-                    if bx < current_x + plat_w - int(50*SCALE): 
-                        bone = Bone(bx, plat_y)
-                        self.game.all_sprites.add(bone)
-                        self.game.bones.add(bone)
-
-            # --- GERA INIMIGOS ---
-            if random.random() > 0.4:
-                ex = current_x + plat_w // 2
-                ey = plat_y - int(150 * SCALE)
-                
-                # Inimigos da Fase 1
-                if difficulty == 1:
-                    enemy_type = random.choice(['gato', 'vaca', 'guarda_chuva'])
-                    e = Enemy(ex, ey, enemy_type, self.game, platform=p)
-                    self.game.all_sprites.add(e)
-                    self.game.enemies.add(e)
-                
-                # Inimigos da Fase 2+ (Adicionado Caranguejo)
-                elif difficulty >= 2:
-                    rnd = random.random()
-                    if rnd < 0.4:
-                        # Gatos e Caranguejos no chão
-                        enemy_type = random.choice(['gato', 'caranguejo']) 
-                        e = Enemy(ex, ey, enemy_type, self.game, platform=p)
-                        self.game.all_sprites.add(e)
-                        self.game.enemies.add(e)
-                    else:
-                        # Pombas no ar
-                        py = random.randint(int(50*SCALE), int(200*SCALE))
-                        px = current_x + random.randint(0, plat_w)
-                        pomba = Pigeon(px, py, self.game)
-                        self.game.all_sprites.add(pomba)
-                        self.game.enemies.add(pomba)
-
-            current_x += plat_w
+            current_x = self.generate_segment(rng, layout, current_x, difficulty)
 
         # 3. Plataforma Final
         current_x += int(150 * SCALE)
-        final_plat = Platform(current_x, ground_y, int(500 * SCALE), int(60 * SCALE), texture_name=ground_img)
-        self.game.all_sprites.add(final_plat)
-        self.game.platforms.add(final_plat)
-        
-        flag = Flag(current_x + int(400 * SCALE), ground_y)
-        self.game.all_sprites.add(flag)
-        self.game.flags.add(flag)
+        layout['platforms'].append([current_x, ground_y, int(500 * SCALE), int(60 * SCALE)])
+        layout['flag'] = [current_x + int(400 * SCALE), ground_y]
+        return layout
+
+    def cache_path(self, difficulty, seed):
+        fname = f'level_{seed}_{difficulty}_{WIDTH}x{HEIGHT}.json'
+        return os.path.join(LEVEL_CACHE_FOLDER, fname)
+
+    def get_layout(self, difficulty, seed):
+        """Layout da memória, do disco ou gerado (e salvo) nessa ordem."""
+        key = (seed, difficulty, WIDTH, HEIGHT)
+        layout = self.layouts.get(key)
+        if layout is not None:
+            return layout
+
+        path = self.cache_path(difficulty, seed)
+        try:
+            with open(path) as f:
+                layout = json.load(f)
+            if layout.get('version') != LAYOUT_VERSION:
+                layout = None
+            else:
+                # Usado agora: é dos últimos a sair no trim_cache
+                os.utime(path)
+        except (OSError, ValueError):
+            layout = None
+
+        if layout is None:
+            layout = self.generate_layout(difficulty, seed)
+            try:
+                os.makedirs(LEVEL_CACHE_FOLDER, exist_ok=True)
+                with open(path, 'w') as f:
+                    json.dump(layout, f, separators=(',', ':'))
+            except OSError as e:
+                print(f"Erro ao salvar fase no cache: {e}")
+            self.trim_cache()
+
+        self.layouts[key] = layout
+        return layout
+
+    def trim_cache(self, keep=LEVEL_CACHE_LIMIT):
+        """Apaga do disco os layouts usados há mais tempo, deixando `keep`. Devolve quantos apagou."""
+        try:
+            names = [name for name in os.listdir(LEVEL_CACHE_FOLDER)
+                     if name.startswith('level_') and name.endswith('.json')]
+        except OSError:
+            return 0
+        if len(names) <= keep:
+            return 0
+        dated = []
+        for name in names:
+            path = os.path.join(LEVEL_CACHE_FOLDER, name)
+            try:
+                dated.append((os.path.getmtime(path), path))
+            except OSError:
+                # Apagado por outro processo no meio do caminho
+                pass
+        dated.sort(reverse=True)
+        removed = 0
+        for _, path in dated[keep:]:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def build_level(self, layout):
+        """Cria os sprites a partir de um layout. Devolve a lista criada."""
+        ground_img = layout['ground']
+        created = []
+        platforms = []
+        for x, y, w, h in layout['platforms']:
+            p = Platform(x, y, w, h, texture_name=ground_img)
+            self.add(p, self.game.platforms)
+            platforms.append(p)
+        created.extend(platforms)
+
+        for bx, by in layout['bones']:
+            bone = Bone(bx, by)
+            self.add(bone, self.game.bones)
+            created.append(bone)
+
+        for enemy_type, ex, ey, plat_idx in layout['enemies']:
+            if enemy_type == 'pomba':
+                e = Pigeon(ex, ey, self.game)
+            else:
+                e = Enemy(ex, ey, enemy_type, self.game, platform=platforms[plat_idx])
+            self.add(e, self.game.enemies)
+            created.append(e)
+
+        if layout['flag']:
+            fx, fy = layout['flag']
+            flag = Flag(fx, fy)
+            self.add(flag, self.game.flags)
+            created.append(flag)
+        return created
+
+    def create_level(self, difficulty, seed=None):
+        if seed is None:
+            seed = random.randrange(2**31)
+        self.build_level(self.get_layout(difficulty, seed))
+
+class LevelStreamer:
+    """Modo infinito: gera a fase aos pedaços conforme a câmera anda.
+
+    Cada trecho é gerado STREAM_AHEAD px à frente da tela e destruído
+    quando fica STREAM_BEHIND px para trás, então a memória e o custo por
+    frame não crescem com a distância. A dificuldade sobe aos poucos com
+    a distância percorrida em vez de pular de fase em fase.
+    """
+    def __init__(self, manager, seed, start_difficulty=1.0):
+        self.manager = manager
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.start_difficulty = start_difficulty
+        self.next_x = 0
+        self.chunks = deque()  # (x final do trecho, sprites do trecho)
+        self.leftovers = []
+
+    def difficulty_at(self, x):
+        d = self.start_difficulty + x / ENDLESS_RAMP
+        return min(d, ENDLESS_MAX_DIFFICULTY)
+
+    def start(self):
+        # Chão inicial igual ao da campanha
+        ground_y = HEIGHT - int(60 * SCALE)
+        layout = self.manager.new_layout(self.start_difficulty, self.seed)
+        layout['platforms'].append([0, ground_y, int(WIDTH * 1.5), int(60 * SCALE)])
+        self.next_x = int(WIDTH * 1.5)
+        self.chunks.append((self.next_x, self.manager.build_level(layout)))
+
+    def update(self, camera):
+        view = camera.view
+
+        # Gera à frente
+        while self.next_x < view.right + STREAM_AHEAD:
+            difficulty = self.difficulty_at(self.next_x)
+            layout = self.manager.new_layout(difficulty, self.seed)
+            # A textura fica a mesma da largada para o chão não "piscar"
+            layout['ground'] = self.manager.ground_texture(int(self.start_difficulty))
+            self.next_x = self.manager.generate_segment(self.rng, layout, self.next_x, difficulty)
+            self.chunks.append((self.next_x, self.manager.build_level(layout)))
+
+        # Libera o que ficou para trás (quem ainda está perto, ex: pombas
+        # que seguem a tela, fica para a próxima limpeza)
+        limit = view.left - STREAM_BEHIND
+        while self.chunks and self.chunks[0][0] < limit:
+            end_x, sprites = self.chunks.popleft()
+            self.leftovers.extend(sprites)
+        if self.leftovers:
+            keep = []
+            for sprite in self.leftovers:
+                if sprite.rect.right < limit:
+                    sprite.kill()
+                elif sprite.alive():
+                    keep.append(sprite)
+            self.leftovers = keep
+
+    @property
+    def difficulty(self):
+        return self.difficulty_at(self.next_x)
@@ -3,18 +3,44 @@ import sys
 import os
 import random 
 import math 
+import time
 from settings import *
 from sprites import Player, Platform, Enemy, Explosion, Flag, Bone
-from weapons import Projectile, WEAPONS_LIST, EnemyProjectile
-from level_manager import LevelManager
-
-GAME_FOLDER = os.path.dirname(__file__)
-ASSETS_FOLDER = os.path.join(GAME_FOLDER, 'assets')
+from weapons import WEAPONS, weapon_name
+from level_manager import LevelManager, LevelStreamer
+from asset_cache import ASSETS, ASSETS_FOLDER
+from asset_pack import AssetPack, pack_path
+from atlas import Atlas, ATLAS_PAGE
+from snapshot import WorldSnapshot
+from replay import InputRecorder, encode, ACT_JUMP, ACT_WEAPON, ACT_CHAR, ACT_RETRY
+from camera import Camera
+from active_region import ActiveRegion
+from spatial import SpatialGroup
+from ui import UICache
+from sim_clock import SIM_CLOCK
+from scheduler import TIMERS
+from resolution import FrameBudget
+from profiler import PROFILER
+from pool import SpritePool
+from bullets import make_bullets
+from entities import make_batches
 
 class Game:
     def __init__(self):
         pygame.init()
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
+        self.headless = HEADLESS
+        if self.headless:
+            self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        elif LOGICAL_RESOLUTION:
+            # Desenha em WIDTH x HEIGHT e o SDL amplia para a tela (na GPU quando possível).
+            # O mouse já chega convertido e os dedos vêm normalizados (0..1).
+            try:
+                self.screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN | pygame.SCALED)
+            except pygame.error as e:
+                print(f"Erro ao ampliar a tela: {e}")
+                self.screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
+        else:
+            self.screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
         pygame.display.set_caption(TITLE)
         self.clock = pygame.time.Clock()
         
@@ -26,20 +52,34 @@ class Game:
         except:
             self.font = pygame.font.Font(None, font_size)
             self.title_font = pygame.font.Font(None, int(60 * SCALE))
+        self.ui = UICache(self.font)
+        # Fonte de largura fixa para o medidor de desempenho (F3)
+        try:
+            self.small_font = pygame.font.SysFont("monospace", int(14 * SCALE))
+        except:
+            self.small_font = pygame.font.Font(None, int(18 * SCALE))
+        self.profiler_lines = []
+        self.profiler_step = 0
             
         self.padding = int(120 * SCALE) 
         self.btn_size = int(HEIGHT * 0.18) 
         
         self.setup_buttons()
         
+        # Imagens já escaladas para esta resolução (geradas na primeira vez)
+        if ASSET_PACK:
+            ASSETS.use_pack(AssetPack(pack_path(WIDTH, HEIGHT), (WIDTH, HEIGHT)))
+        # Sprites pequenos (personagens, inimigos, itens, explosão) numa só superfície
+        if USE_ATLAS:
+            ASSETS.use_atlas(Atlas(page_size=int(ATLAS_PAGE * SCALE)))
+
         # --- CARREGAR IMAGEM DO MENU ---
         # Tenta carregar a imagem estilo Master System
         self.menu_bg_image = None
         try:
             bg_path = os.path.join(ASSETS_FOLDER, 'menu_bg.png')
             if os.path.exists(bg_path):
-                img = pygame.image.load(bg_path).convert()
-                self.menu_bg_image = pygame.transform.scale(img, (WIDTH, HEIGHT))
+                self.menu_bg_image = ASSETS.get('menu_bg.png', (WIDTH, HEIGHT), alpha=False)
         except Exception as e:
             print(f"Erro ao carregar menu_bg: {e}")
         
@@ -48,40 +88,67 @@ class Game:
         self.last_shot_time = 0
         self.shoot_delay = 250 
 
+        # --- POOLS (tiros e explosões reaproveitados) ---
+        self.explosion_pool = SpritePool(Explosion, POOL_CAPS['explosion'])
+        self.explosion_pool.prewarm(4, (0, 0))
+        self.all_sprites = None
+
         # --- SISTEMA DE JOGO ---
         self.level = 1
         self.total_score = 0
         self.level_manager = LevelManager(self)
-        self.game_mode = 'campaign' # 'campaign' ou 'mission'
+        # Semente de cada fase nesta sessão: tentar de novo repete a mesma fase
+        self.level_seeds = {}
+        self.game_mode = 'campaign' # 'campaign', 'mission' ou 'endless'
+        self.streamer = None
+        # Fotos da fase: início (tentar de novo) e último checkpoint
+        self.level_start = None
+        self.saved_checkpoint = None
+        # x em que a fase guarda o checkpoint (meio do caminho até a bandeira)
+        self.checkpoint_x = None
+        # Toques de um passo só (trocar arma, pular pelo clique...) até o próximo apply_input
+        self.pending_actions = 0
+        # Gravação das entradas de cada fase (replay.py)
+        self.record_replays = RECORD_REPLAYS
+        self.replay_folder = REPLAY_FOLDER
+        self.recorder = None
+        self.last_recording = None
+        # Fase montada ou retomada: o próximo frame do run() descarta o tempo
+        # que passou fora do jogo (menu, montagem, tela entre fases)
+        self.resync = False
 
         self.bg_parts = []
+        self.bg_file = None
         self.bg_width = WIDTH
-        self.bg_scroll = 0
+        self.camera = Camera()
+
+        # Tiros do jogador e das pombas (arrays NumPy ou sprites)
+        self.bullets = make_bullets(self.camera)
+        self.bullets_enemy = make_bullets(self.camera)
         self.load_backgrounds()
 
         self.state = 'MENU'
         self.running = True
+        # A fase 1 já vai sendo carregada enquanto o menu está na tela
+        self.level_manager.prefetch_assets(self.level)
+        # Tela estática (menus): só redesenha se o estado mudou ou a janela pediu
+        self.drawn_state = None
+        self.screen_dirty = True
+        self.frame_budget = FrameBudget(1000.0 / RENDER_FPS, HEIGHT) if DYNAMIC_RESOLUTION else None
 
     def load_backgrounds(self):
         fname = f'fundo{self.level}.png'
         path = os.path.join(ASSETS_FOLDER, fname)
+        # O fundo da fase anterior é grande; libera antes de trocar
+        if self.bg_file and self.bg_file != fname:
+            ASSETS.evict(self.bg_file)
+        self.bg_file = fname
         self.bg_parts = []
         try:
             if os.path.exists(path):
-                full_bg = pygame.image.load(path).convert()
-                full_w = full_bg.get_width()
-                full_h = full_bg.get_height()
-                part_w = full_w // 3
-                
-                scale_ratio = HEIGHT / full_h
-                new_w = int(part_w * scale_ratio)
-                new_h = int(full_h * scale_ratio)
-                
-                for i in range(3):
-                    part = full_bg.subsurface((part_w * i, 0, part_w, full_h))
-                    self.bg_parts.append(pygame.transform.scale(part, (new_w, new_h)))
-                
-                self.bg_width = new_w 
+                # Três partes escaladas para a altura da tela (talvez já prontas pelo prefetch)
+                self.bg_parts = list(ASSETS.get_fitted_strip(fname, count=3, height=HEIGHT, alpha=False))
+                self.bg_width = self.bg_parts[0].get_width()
             else:
                 pass 
         except Exception as e:
@@ -126,7 +193,7 @@ class Game:
         self.btn_campanha = pygame.Rect(center_x, HEIGHT * 0.65, menu_btn_w, menu_btn_h)
         self.btn_missao = pygame.Rect(center_x, HEIGHT * 0.80, menu_btn_w, menu_btn_h)
 
-        # --- BOTÕES DE SELEÇÃO DE FASE (1 a 5) ---
+        # --- BOTÕES DE SELEÇÃO DE FASE (1 a 5 + modo infinito) ---
         self.level_buttons = []
         cols = 3
         start_x = WIDTH * 0.2
@@ -134,52 +201,205 @@ class Game:
         gap_x = int(50 * SCALE)
         btn_lvl_size = int(80 * SCALE)
         
-        for i in range(5): 
+        for i in range(6): 
             row = i // cols
             col = i % cols
             x = start_x + col * (btn_lvl_size + gap_x)
             y = start_y + row * (btn_lvl_size + gap_x)
             rect = pygame.Rect(x, y, btn_lvl_size, btn_lvl_size)
-            self.level_buttons.append({'rect': rect, 'level': i+1})
+            if i < 5:
+                self.level_buttons.append({'rect': rect, 'level': i+1, 'mode': 'mission', 'label': str(i+1)})
+            else:
+                self.level_buttons.append({'rect': rect, 'level': 1, 'mode': 'endless', 'label': "INF"})
 
         self.btn_back = pygame.Rect(WIDTH - int(150*SCALE), int(20*SCALE), int(130*SCALE), int(50*SCALE))
 
+        # --- TELA DE FIM DE JOGO ---
+        self.btn_retry = pygame.Rect(center_x, HEIGHT * 0.50, menu_btn_w, menu_btn_h)
+        self.btn_quit_level = pygame.Rect(center_x, HEIGHT * 0.65, menu_btn_w, menu_btn_h)
+
     def new_game(self):
+        self.stop_recording()
+        # Só sorteia se a fase ainda não tem semente (o replay restaura o estado aleatório logo depois)
+        if self.level not in self.level_seeds:
+            self.level_seeds[self.level] = random.randrange(2**31)
+        seed = self.level_seeds[self.level]
+        if self.record_replays:
+            # Guarda o estado aleatório antes de qualquer sorteio da fase
+            self.start_recording()
+
+        # Devolve aos pools os tiros/explosões da partida anterior
+        self.bullets.clear()
+        self.bullets_enemy.clear()
+        if self.all_sprites is not None:
+            for sprite in self.effects.sprites():
+                sprite.kill()
+        # Timers da fase anterior (pombas, animação do jogador antigo)
+        TIMERS.clear()
+
         self.all_sprites = pygame.sprite.Group()
-        self.platforms = pygame.sprite.Group()
+        self.platforms = SpatialGroup()
         self.enemies = pygame.sprite.Group()
-        self.bullets = pygame.sprite.Group()
-        self.bullets_enemy = pygame.sprite.Group()
         self.flags = pygame.sprite.Group()
         self.bones = pygame.sprite.Group() 
+        self.effects = pygame.sprite.Group()
+
+        # Só o que está perto da câmera é atualizado e desenhado
+        self.camera.reset()
+        self.region = ActiveRegion(self.camera)
+        self.active_platforms = self.region.track(self.platforms)
+        self.active_enemies = self.region.track(self.enemies)
+        self.active_bones = self.region.track(self.bones)
+        self.active_flags = self.region.track(self.flags)
+        # Com NumPy, inimigos e ossos acordados são atualizados em lote
+        self.batches = [self.region.track(source, batch) for source, batch in make_batches(self)]
         
         self.load_backgrounds()
-        self.bg_scroll = 0
 
-        self.level_manager.create_level(difficulty=self.level)
+        self.level_manager.preload_assets(self.level)
+        if self.game_mode == 'endless':
+            # Fase gerada aos pedaços enquanto o jogador corre
+            self.streamer = LevelStreamer(self.level_manager, seed, start_difficulty=self.level)
+            self.streamer.start()
+        else:
+            self.streamer = None
+            self.level_manager.create_level(difficulty=self.level, seed=seed)
         
         self.player = Player(self)
         self.all_sprites.add(self.player)
         self.state = 'PLAYING'
+        # Tentar de novo volta para cá sem recriar a fase
+        self.level_start = WorldSnapshot(self) if self.streamer is None else None
+        self.saved_checkpoint = None
+        flags = self.flags.sprites()
+        self.checkpoint_x = flags[0].rect.x // 2 if self.streamer is None and flags else None
+        self.pending_actions = 0
+        self.resync = True
+        if self.recorder:
+            self.recorder.set_backends(self)
+
+        if self.game_mode == 'campaign':
+            # Enquanto esta fase roda, a próxima vai sendo lida em segundo plano
+            self.level_manager.prefetch_assets(self.level + 1)
+
+    def start_recording(self):
+        path = None
+        if self.replay_folder:
+            name = f"f{self.level}_s{self.level_seeds[self.level]}_{int(time.time())}.sprp"
+            path = os.path.join(self.replay_folder, name)
+        self.recorder = InputRecorder(self, path)
+
+    def stop_recording(self):
+        if self.recorder is None:
+            return
+        recorder = self.recorder
+        self.recorder = None
+        self.last_recording = recorder
+        path = recorder.save()
+        if path:
+            print(f"Replay salvo: {path}")
+
+    def checkpoint(self):
+        """Guarda o estado atual da fase; `quick_retry` volta para ele.
+
+        Chamado pelo update quando o jogador passa do checkpoint_x: sai só
+        do estado da simulação, então o replay guarda o mesmo checkpoint.
+        """
+        if self.streamer is not None:
+            return False
+        self.saved_checkpoint = WorldSnapshot(self)
+        return True
+
+    def quick_retry(self):
+        """Recomeça do último checkpoint (ou do início da fase) reaproveitando os sprites."""
+        snapshot = self.saved_checkpoint or self.level_start
+        if snapshot is None:
+            self.new_game()
+        else:
+            snapshot.restore(self)
+            self.resync = True
 
     def run(self):
+        # Laço de tempo fixo: a simulação anda em passos de 1/SIM_FPS,
+        # independente da taxa de desenho; o resto vira interpolação
+        step_time = 1.0 / SIM_FPS
+        accumulator = 0.0
         while self.running:
-            self.clock.tick(FPS)
-            if self.state == 'MENU':
-                self.events_menu()
-                self.draw_menu()
-            elif self.state == 'MISSION_SELECT':
-                self.events_mission_select()
-                self.draw_mission_select()
-            elif self.state == 'PLAYING':
-                self.events()
-                self.update()
-                self.draw()
+            dt = self.clock.tick(RENDER_FPS) / 1000.0
+            if self.resync:
+                # Esse tempo não foi de jogo: a simulação recomeça do zero
+                # em vez de correr MAX_CATCHUP_STEPS passos de uma vez
+                self.resync = False
+                dt = accumulator = 0.0
+            PROFILER.begin_frame()
+            # Estado do começo do frame: se o menu começou a fase agora, a
+            # simulação só anda no próximo frame, com o relógio zerado
+            state = self.state
+            if state in ('MENU', 'MISSION_SELECT', 'GAME_OVER'):
+                self.wait_for_event()
+                if state == 'MENU':
+                    self.events_menu()
+                    self.draw_menu()
+                elif state == 'MISSION_SELECT':
+                    self.events_mission_select()
+                    self.draw_mission_select()
+                else:
+                    self.events_game_over()
+                    self.draw_game_over()
+                if self.state in ('MENU', 'MISSION_SELECT', 'GAME_OVER') and ASSETS.unbaked:
+                    # Menu já na tela e parado: bom momento para guardar o que foi escalado
+                    ASSETS.bake()
+            elif state == 'PLAYING':
+                accumulator += dt
+                inputs = self.read_input()
+                PROFILER.lap('events')
+                steps = 0
+                while accumulator >= step_time and self.state == 'PLAYING' and not self.resync:
+                    if steps == MAX_CATCHUP_STEPS:
+                        # Aparelho muito lento: desiste de alcançar o relógio
+                        accumulator = 0.0
+                        break
+                    self.apply_input(*inputs)
+                    self.update()
+                    accumulator -= step_time
+                    steps += 1
+                if self.state == 'PLAYING':
+                    self.draw(alpha=accumulator / step_time)
+                    if PROFILER.enabled:
+                        self.profile_counts()
+                        PROFILER.end_frame()
+                if self.frame_budget:
+                    # Tempo gasto no frame anterior, sem contar a espera do tick
+                    lower = self.frame_budget.sample(self.clock.get_rawtime())
+                    if lower:
+                        print(f"Frames lentos: resolução {lower}p na próxima abertura")
+
+    def wait_for_event(self):
+        # Menu já desenhado e parado: dorme até chegar um evento
+        if self.drawn_state != self.state or self.screen_dirty:
+            return
+        event = pygame.event.wait(MENU_IDLE_TIMEOUT)
+        if event.type != pygame.NOEVENT:
+            pygame.event.post(event)
+
+    def needs_redraw(self, state):
+        if self.drawn_state == state and not self.screen_dirty:
+            return False
+        self.drawn_state = state
+        self.screen_dirty = False
+        return True
+
+    def check_window_event(self, event):
+        # Janela voltou a aparecer (app saiu do segundo plano, etc.): redesenha
+        if event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.WINDOWSIZECHANGED,
+                          pygame.APP_DIDENTERFOREGROUND, pygame.VIDEOEXPOSE):
+            self.screen_dirty = True
 
     def events_menu(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            self.check_window_event(event)
             
             if event.type == pygame.FINGERDOWN or event.type == pygame.MOUSEBUTTONDOWN:
                 if event.type == pygame.FINGERDOWN:
@@ -197,6 +417,10 @@ class Game:
                     self.state = 'MISSION_SELECT'
 
     def draw_menu(self):
+        # Nada mudou desde o último frame: a tela já está certa
+        if not self.needs_redraw('MENU'):
+            return
+
         # 1. Desenha o fundo
         if self.menu_bg_image:
             self.screen.blit(self.menu_bg_image, (0, 0))
@@ -207,9 +431,9 @@ class Game:
             title_text = "SUPER PUG GAME"
             t_w, t_h = self.title_font.size(title_text)
             t_pos = (WIDTH//2 - t_w//2, HEIGHT * 0.15)
-            shadow = self.title_font.render(title_text, True, (0, 0, 0))
+            shadow = self.ui.label('title_shadow', title_text, (0, 0, 0), self.title_font)
             self.screen.blit(shadow, (t_pos[0] + 5, t_pos[1] + 5))
-            title = self.title_font.render(title_text, True, (255, 255, 0))
+            title = self.ui.label('title', title_text, (255, 255, 0), self.title_font)
             self.screen.blit(title, t_pos)
         
         # 2. Botões (Usei alpha maior para destacar em cima da arte)
@@ -223,6 +447,7 @@ class Game:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            self.check_window_event(event)
             
             if event.type == pygame.FINGERDOWN or event.type == pygame.MOUSEBUTTONDOWN:
                 if event.type == pygame.FINGERDOWN:
@@ -237,29 +462,35 @@ class Game:
 
                 for btn in self.level_buttons:
                     if btn['rect'].collidepoint(x, y):
-                        self.game_mode = 'mission'
+                        self.game_mode = btn['mode']
                         self.level = btn['level']
                         self.total_score = 0
                         self.new_game()
 
     def draw_mission_select(self):
+        if not self.needs_redraw('MISSION_SELECT'):
+            return
+
         # Fundo escuro para a seleção (ou poderia usar a mesma imagem com blur/escurecida)
         self.screen.fill((40, 40, 60)) 
         
-        title = self.font.render("ESCOLHA A MISSÃO:", True, (255, 255, 255))
+        title = self.ui.label('mission_title', "ESCOLHA A MISSÃO:", (255, 255, 255))
         self.screen.blit(title, (WIDTH * 0.1, HEIGHT * 0.15))
         
         self.draw_transparent_btn(self.btn_back, "VOLTAR", color=(255, 100, 100), alpha=200)
 
         for btn in self.level_buttons:
             rect = btn['rect']
-            lvl = btn['level']
             # Cores diferentes para destacar botões de fase
-            self.draw_transparent_btn(rect, str(lvl), color=(100, 255, 100), alpha=150, font_scale=1.5)
+            self.draw_transparent_btn(rect, btn['label'], color=(100, 255, 100), alpha=150, font_scale=1.5)
 
         pygame.display.flip()
 
     def events(self):
+        self.apply_input(*self.read_input())
+
+    def read_input(self):
+        # Junta dedos, mouse e teclado em 4 booleanos por frame
         touch_left = False
         touch_right = False
         touch_up = False
@@ -275,10 +506,13 @@ class Game:
                 self.fingers[event.finger_id] = (x, y)
                 
                 if event.type == pygame.FINGERDOWN:
-                    if self.btn_weapon.collidepoint((x, y)):
-                        self.player.weapon_index = (self.player.weapon_index + 1) % len(WEAPONS_LIST)
+                    if len(self.fingers) == 3:
+                        # Três dedos na tela: liga/desliga o medidor de desempenho
+                        PROFILER.toggle()
+                    elif self.btn_weapon.collidepoint((x, y)):
+                        self.pending_actions |= ACT_WEAPON
                     elif self.btn_char.collidepoint((x, y)):
-                        self.player.next_character()
+                        self.pending_actions |= ACT_CHAR
 
             elif event.type == pygame.FINGERUP:
                 if event.finger_id in self.fingers:
@@ -286,7 +520,15 @@ class Game:
 
             if event.type == pygame.MOUSEBUTTONDOWN:
                 mx, my = event.pos
-                if self.btn_up.collidepoint((mx, my)): self.player.jump()
+                if self.btn_up.collidepoint((mx, my)): self.pending_actions |= ACT_JUMP
+
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_r:
+                    self.pending_actions |= ACT_RETRY
+                elif event.key == pygame.K_F3:
+                    PROFILER.toggle()
+                elif event.key == pygame.K_F4 and PROFILER.enabled:
+                    self.export_profile()
 
         for finger_pos in self.fingers.values():
             if self.btn_left.collidepoint(finger_pos): touch_left = True
@@ -308,38 +550,71 @@ class Game:
             if keys[pygame.K_RIGHT]: touch_right = True
             if keys[pygame.K_SPACE] or keys[pygame.K_UP]: touch_up = True
 
+        return touch_left, touch_right, touch_up, holding_fire
+
+    def apply_input(self, touch_left, touch_right, touch_up, holding_fire):
+        # Ações de toque entram aqui (e não no read_input) para o replay ver tudo por passo
+        actions = self.pending_actions
+        self.pending_actions = 0
+        if self.recorder:
+            self.recorder.record(encode(touch_left, touch_right, touch_up, holding_fire, actions))
+        if actions & ACT_RETRY:
+            self.quick_retry()
+        if actions & ACT_WEAPON:
+            self.player.weapon_index = (self.player.weapon_index + 1) % len(WEAPONS)
+        if actions & ACT_CHAR:
+            self.player.next_character()
+        if actions & ACT_JUMP:
+            self.player.jump()
+
         self.player.update_touch(touch_left, touch_right)
         
         if touch_up: self.player.jump()
             
         if holding_fire:
-            now = pygame.time.get_ticks()
+            now = SIM_CLOCK.ticks
             if now - self.last_shot_time > self.shoot_delay:
                 self.shoot()
                 self.last_shot_time = now
 
     def shoot(self):
         dir = 1 if self.player.facing_right else -1
-        b = Projectile(self.player.rect.centerx, self.player.rect.centery, dir, self.player.weapon_index)
-        self.all_sprites.add(b)
-        self.bullets.add(b)
+        weapon = WEAPONS[self.player.weapon_index]
+        image = weapon.image_right if dir > 0 else weapon.image_left
+        self.bullets.spawn(self.player.rect.centerx, self.player.rect.centery, weapon.speed * dir, 0,
+                           image, weapon.damage, weapon.index)
 
     def update(self):
-        self.all_sprites.update()
+        SIM_CLOCK.advance()
+        self.camera.begin_step(self.moving_sprites())
+        self.player.update()
         
-        if self.player.rect.right >= WIDTH * 0.4:
-            scroll = self.player.rect.right - (WIDTH * 0.4)
-            self.player.rect.right = WIDTH * 0.4 
-            self.bg_scroll += scroll 
-            
-            for sprite in self.all_sprites:
-                if sprite != self.player:
-                    sprite.rect.x -= scroll
-
-        hits = pygame.sprite.spritecollide(self.player, self.bones, True)
+        # A câmera segue o jogador; os sprites continuam no mundo
+        self.camera.follow(self.player.rect)
+        if self.streamer:
+            self.streamer.update(self.camera)
+        self.region.refresh()
+        # Só o que venceu neste passo: troca de frame, recarga das pombas, explosões
+        TIMERS.advance()
+        PROFILER.lap('update.world')
+
+        # Plataformas e bandeira não têm update; só quem está acordado roda
+        if self.batches:
+            for batch in self.batches:
+                batch.step()
+        else:
+            self.active_enemies.update()
+            self.active_bones.update()
+        PROFILER.lap('update.entities')
+        self.bullets.update()
+        self.bullets_enemy.update()
+        # Explosões não têm update: cada frame é um timer
+        PROFILER.lap('update.bullets')
+
+        hits = pygame.sprite.spritecollide(self.player, self.active_bones, True)
         for bone in hits: self.total_score += 50 
 
-        if pygame.sprite.spritecollide(self.player, self.flags, False):
+        if pygame.sprite.spritecollide(self.player, self.active_flags, False):
             self.total_score += 1000
             self.show_level_screen(f"NIVEL {self.level} COMPLETO!")
             
@@ -352,21 +627,21 @@ class Game:
         if self.player.rect.top > HEIGHT: 
             self.game_over_logic()
 
-        hits = pygame.sprite.spritecollide(self.player, self.bullets_enemy, True)
-        if hits:
+        if self.bullets_enemy.collide_rect(self.player.rect):
             self.player.hp -= 10
 
-        hits = pygame.sprite.groupcollide(self.enemies, self.bullets, False, True)
-        for enemy, bullets_list in hits.items():
-            for b in bullets_list:
-                enemy.hp -= b.damage
+        hits = self.bullets.collide(self.active_enemies)
+        for enemy, damages in hits.items():
+            for damage in damages:
+                enemy.hp -= damage
                 if enemy.hp <= 0:
-                    expl = Explosion(enemy.rect.center)
+                    expl = self.explosion_pool.acquire(enemy.rect.center)
                     self.all_sprites.add(expl)
+                    self.effects.add(expl)
                     enemy.kill()
                     self.total_score += 100 
 
-        hits = pygame.sprite.spritecollide(self.player, self.enemies, False)
+        hits = pygame.sprite.spritecollide(self.player, self.active_enemies, False)
         if hits:
             self.player.hp -= 1
             if self.player.rect.x < hits[0].rect.x: self.player.rect.x -= int(20*SCALE)
@@ -374,8 +649,53 @@ class Game:
 
         if self.player.hp <= 0:
             self.game_over_logic()
+        elif (self.checkpoint_x is not None and self.state == 'PLAYING'
+              and self.player.on_ground and self.player.rect.x >= self.checkpoint_x):
+            # Meio da fase, com o pé no chão: tentar de novo volta para cá
+            self.checkpoint_x = None
+            self.checkpoint()
+        PROFILER.lap('update.collide')
+
+        if self.recorder:
+            self.recorder.check()
+            if self.state != 'PLAYING':
+                self.stop_recording()
+
+    def profile_counts(self):
+        PROFILER.count('all_sprites', len(self.all_sprites))
+        PROFILER.count('enemies', len(self.enemies))
+        PROFILER.count('bullets', len(self.bullets))
+        PROFILER.count('bullets_enemy', len(self.bullets_enemy))
+        PROFILER.count('timers', len(TIMERS))
+
+    def export_profile(self):
+        folder = os.path.join(os.path.dirname(__file__), 'cache')
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"profile_{SIM_CLOCK.steps}.csv")
+        count = PROFILER.export(path)
+        print(f"Perfil salvo: {path} ({count} frames)")
+
+    def pool_stats(self):
+        stats = {'explosion': self.explosion_pool.stats()}
+        for label, system in (('bullet', self.bullets), ('enemy_bullet', self.bullets_enemy)):
+            for key, st in system.stats().items():
+                name = key if isinstance(key, str) else weapon_name(key)
+                stats[f"{label}:{name}"] = st
+        return stats
+
+    def moving_sprites(self):
+        # Só o que se mexe precisa de interpolação (plataformas não)
+        yield self.player
+        for group in (self.active_enemies, self.active_bones, self.effects):
+            yield from group
+        yield from self.bullets.sprites()
+        yield from self.bullets_enemy.sprites()
 
     def game_over_logic(self):
+        # Tela de fim de jogo: tentar de novo (quick_retry) ou sair da fase
+        self.state = 'GAME_OVER'
+
+    def leave_level(self):
         if self.game_mode == 'campaign':
             self.level = 1
             self.total_score = 0
@@ -383,27 +703,63 @@ class Game:
         else:
             self.state = 'MISSION_SELECT'
 
-    def draw_transparent_btn(self, rect, text, color=(255, 255, 255), alpha=80, font_scale=1.0):
-        s = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(s, (0, 0, 0, alpha), s.get_rect(), border_radius=15)
-        pygame.draw.rect(s, color, s.get_rect(), 2, border_radius=15)
-        
-        if font_scale != 1.0:
-            cur_font = pygame.font.Font(None, int(30 * SCALE * font_scale))
-        else:
-            cur_font = self.font
+    def events_game_over(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            self.check_window_event(event)
+
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_r:
+                    self.quick_retry()
+                    return
+                elif event.key == pygame.K_ESCAPE:
+                    self.leave_level()
+                    return
 
-        txt_surf = cur_font.render(text, True, color)
-        txt_rect = txt_surf.get_rect(center=(rect.width//2, rect.height//2))
-        s.blit(txt_surf, txt_rect)
+            if event.type == pygame.FINGERDOWN or event.type == pygame.MOUSEBUTTONDOWN:
+                if event.type == pygame.FINGERDOWN:
+                    x = int(event.x * WIDTH)
+                    y = int(event.y * HEIGHT)
+                else:
+                    x, y = event.pos
+
+                if self.btn_retry.collidepoint(x, y):
+                    self.quick_retry()
+                    return
+                elif self.btn_quit_level.collidepoint(x, y):
+                    self.leave_level()
+                    return
+
+    def draw_game_over(self):
+        if not self.needs_redraw('GAME_OVER'):
+            return
+
+        self.screen.fill((40, 20, 20))
+        title = self.ui.label('game_over_title', "FIM DE JOGO", (255, 80, 80), self.title_font)
+        self.screen.blit(title, (WIDTH // 2 - title.get_width() // 2, HEIGHT * 0.2))
+        score = self.ui.label('game_over_score', f"SCORE: {self.total_score}", (255, 255, 255))
+        self.screen.blit(score, (WIDTH // 2 - score.get_width() // 2, HEIGHT * 0.38))
+
+        self.draw_transparent_btn(self.btn_retry, "TENTAR DE NOVO", color=(255, 255, 0), alpha=200, font_scale=1.1)
+        label = "MENU" if self.game_mode == 'campaign' else "SELEÇÃO DE FASE"
+        self.draw_transparent_btn(self.btn_quit_level, label, color=(255, 255, 255), alpha=200, font_scale=1.1)
+
+        pygame.display.flip()
+
+    def draw_transparent_btn(self, rect, text, color=(255, 255, 255), alpha=80, font_scale=1.0):
+        s = self.ui.button(rect.size, text, color, alpha, font_scale)
         self.screen.blit(s, rect.topleft)
 
-    def draw(self):
+    def draw(self, alpha=1.0):
+        # Em jogo a câmera rola quase todo frame, então a tela inteira é refeita
+        self.drawn_state = 'PLAYING'
+        self.camera.set_alpha(alpha)
         self.screen.fill((135, 206, 235))
         
         if self.bg_parts:
             part_w = self.bg_width
-            start_scroll = self.bg_scroll
+            start_scroll = self.camera.draw_x
             first_tile_idx = int(start_scroll // part_w)
             tile_offset = start_scroll % part_w
             draw_x = -tile_offset
@@ -414,13 +770,26 @@ class Game:
                 self.screen.blit(self.bg_parts[img_idx], (draw_x, 0))
                 draw_x += part_w
                 current_idx += 1
+        PROFILER.lap('draw.background')
         
-        self.all_sprites.draw(self.screen)
+        # Só desenha o que aparece na tela, plataformas por baixo
+        self.camera.draw(self.region.visible(self.active_platforms), self.screen)
+        for group in (self.active_flags, self.active_bones, self.active_enemies):
+            self.camera.draw(self.region.visible(group), self.screen)
+        self.camera.draw([self.player], self.screen)
+        self.bullets.draw(self.screen)
+        self.bullets_enemy.draw(self.screen)
+        self.camera.draw(self.effects, self.screen)
+        PROFILER.lap('draw.sprites')
         
         # HUD
-        s_txt = self.font.render(f"SCORE: {self.total_score}", True, (255, 255, 255))
-        mode_txt = "CAMPAIGN" if self.game_mode == 'campaign' else "MISSION"
-        l_txt = self.font.render(f"LVL: {self.level} | {mode_txt}", True, (255, 255, 0))
+        s_txt = self.ui.label('score', f"SCORE: {self.total_score}", (255, 255, 255))
+        if self.streamer:
+            lvl_txt = f"LVL: {self.streamer.difficulty:.1f} | ENDLESS"
+        else:
+            mode_txt = "CAMPAIGN" if self.game_mode == 'campaign' else "MISSION"
+            lvl_txt = f"LVL: {self.level} | {mode_txt}"
+        l_txt = self.ui.label('level', lvl_txt, (255, 255, 0))
         
         self.screen.blit(s_txt, (WIDTH//2 - s_txt.get_width()//2, 10))
         gap = s_txt.get_height() + 5
@@ -434,34 +803,70 @@ class Game:
 
         # Botão Tiro
         visual_size = int(self.btn_size * 1.2) 
-        surf = pygame.Surface((visual_size, visual_size), pygame.SRCALPHA)
-        center = (visual_size // 2, visual_size // 2)
-        radius = visual_size // 2
-        pygame.draw.circle(surf, (0, 0, 0, BTN_ALPHA), center, radius)
-        pygame.draw.circle(surf, (255, 255, 255), center, radius, 2)
-        txt = self.font.render("TIRO", True, (255, 255, 255))
-        txt_rect = txt.get_rect(center=center)
-        surf.blit(txt, txt_rect)
+        surf = self.ui.round_button(visual_size, "TIRO", alpha=BTN_ALPHA)
         final_rect = surf.get_rect(center=self.btn_fire_center_point)
         self.screen.blit(surf, final_rect)
 
         # Menus Superiores
-        w_name = WEAPONS_LIST[self.player.weapon_index]['name']
+        w_name = WEAPONS[self.player.weapon_index].name
         self.draw_transparent_btn(self.btn_weapon, w_name, alpha=BTN_ALPHA)
         
         c_name = self.player.char_list[self.player.char_index].upper()
         self.draw_transparent_btn(self.btn_char, c_name, alpha=BTN_ALPHA)
 
-        self.draw_health_bar(self.screen, self.player.rect.x, self.player.rect.y - 15, self.player.hp)
+        hp_x, hp_y = self.camera.screen_pos(self.player)
+        self.draw_health_bar(self.screen, hp_x, hp_y - 15, self.player.hp)
+        if PROFILER.enabled:
+            self.draw_profiler()
+        PROFILER.lap('draw.hud')
         
         pygame.display.flip()
+        PROFILER.lap('flip')
+
+    def draw_profiler(self):
+        # Texto refeito só a cada 30 frames: ler números mudando a 60 Hz não dá
+        if not self.profiler_lines or SIM_CLOCK.steps - self.profiler_step >= 30:
+            self.profiler_step = SIM_CLOCK.steps
+            lines = ["fase            min   méd   p99"] + PROFILER.overlay_lines()
+            self.profiler_lines = [self.small_font.render(line, True, (255, 255, 0), (0, 0, 0)) for line in lines]
+        y = int(80 * SCALE)
+        for surf in self.profiler_lines:
+            self.screen.blit(surf, (10, y))
+            y += surf.get_height()
 
     def show_level_screen(self, text):
-        self.screen.fill((0,0,0))
+        """Tela entre fases: fica até as imagens adiantadas ficarem prontas
+        (com barra de progresso) e pelo menos LEVEL_SCREEN_MIN_MS para dar
+        tempo de ler."""
         txt = self.font.render(text, True, (255,255,255))
-        self.screen.blit(txt, (WIDTH//2 - txt.get_width()//2, HEIGHT//2))
-        pygame.display.flip()
-        pygame.time.delay(2000)
+        bar = pygame.Rect(0, 0, int(WIDTH * 0.4), int(12 * SCALE))
+        bar.center = (WIDTH // 2, HEIGHT // 2 + txt.get_height() * 2)
+        start = pygame.time.get_ticks()
+        while True:
+            remaining = ASSETS.collect()
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.running = False
+            done, total = ASSETS.progress()
+
+            self.screen.fill((0,0,0))
+            self.screen.blit(txt, (WIDTH//2 - txt.get_width()//2, HEIGHT//2))
+            pygame.draw.rect(self.screen, (255, 255, 255), bar, 1)
+            fill = bar.inflate(-4, -4)
+            fill.width = int(fill.width * done / total)
+            pygame.draw.rect(self.screen, (255, 255, 0), fill)
+            pygame.display.flip()
+
+            waited = pygame.time.get_ticks() - start
+            if remaining == 0 and (self.headless or waited >= LEVEL_SCREEN_MIN_MS):
+                break
+            if not self.running:
+                break
+            self.clock.tick(30)
+        if ASSETS.unbaked:
+            ASSETS.bake()
+        self.drawn_state = None
+        self.resync = True
     
     def draw_health_bar(self, surface, x, y, pct):
         if pct < 0: pct = 0
@@ -475,3 +880,4 @@ class Game:
 if __name__ == "__main__":
     g = Game()
     g.run()
+    g.stop_recording()
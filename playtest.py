@@ -0,0 +1,385 @@
+"""Valida fases geradas sem tela: conta de alcance + um robô que joga.
+
+Uso:
+    python playtest.py --seeds 2000 --bot 200 --levels 1-5
+    python playtest.py --levels 4,5 --seeds 10000 --bot 0 --save sem_solucao.json
+    SUPERPUG_RESOLUTION=2400x1080 python playtest.py --bot 50
+
+Para cada dificuldade e semente, gera o layout com
+LevelManager.generate_layout e confere se dá para ir da primeira
+plataforma até a da bandeira usando as mesmas contas do Player
+(JUMP_FORCE, GRAVITY, PLAYER_SPEED e a regra de pouso do Player.update).
+Nas primeiras `--bot` sementes um robô também joga a fase no Game de
+verdade (sem tela e sem limite de FPS) e mede o tempo até a bandeira.
+As sementes são divididas entre processos (`--jobs`).
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
+# Precisa vir antes de importar settings (que inicializa o pygame)
+os.environ.setdefault('SUPERPUG_HEADLESS', '1')
+
+import pygame
+from settings import *
+from sprites import player_size
+from level_manager import LevelManager
+from sim_clock import SIM_CLOCK
+from weapons import WEAPONS
+from replay import ACT_WEAPON
+
+PLAYER_W, PLAYER_H = player_size()
+# O Player só pousa se o pé estiver até esta distância abaixo da base da plataforma
+LANDING_SLACK = 10
+# Arma do robô (o jogador pode trocar a qualquer hora, então usa a mais forte)
+BOT_WEAPON = 'Raio'
+# Distância (px) à frente em que um inimigo na linha de tiro faz o robô parar
+BOT_LOOKAHEAD = int(250 * SCALE)
+# Passos parado atirando antes de seguir mesmo assim (inimigo fora de alcance)
+BOT_PATIENCE = 120
+
+def _step_x():
+    # O Rect arredonda cada soma; o passo real pode não ser exatamente PLAYER_SPEED
+    rect = pygame.Rect(0, 0, PLAYER_W, PLAYER_H)
+    rect.x += PLAYER_SPEED
+    return rect.x
+
+STEP_X = _step_x()
+
+_arcs = {}
+
+def jump_arc(bottom):
+    """[(bottom, vel_y)] a cada passo de um pulo que sai com os pés em `bottom`.
+
+    Segue o Player.update num Rect de verdade (mesmo arredondamento) e
+    para quando o jogador cai para fora da tela.
+    """
+    arc = _arcs.get(bottom)
+    if arc is None:
+        rect = pygame.Rect(0, 0, PLAYER_W, PLAYER_H)
+        rect.bottom = bottom
+        vel = JUMP_FORCE
+        arc = []
+        while rect.top <= HEIGHT:
+            vel += GRAVITY
+            rect.y += vel
+            arc.append((rect.bottom, vel))
+        _arcs[bottom] = arc
+    return arc
+
+def jump_limits():
+    """(altura máxima, alcance no mesmo nível) de um pulo a partir do chão."""
+    ground_y = HEIGHT - int(60 * SCALE)
+    arc = jump_arc(ground_y)
+    rise = ground_y - min(bottom for bottom, vel in arc)
+    for t, (bottom, vel) in enumerate(arc, 1):
+        if vel >= 0 and bottom >= ground_y:
+            return rise, t * STEP_X
+    return rise, len(arc) * STEP_X
+
+class LevelCheck:
+    """Grafo de plataformas ligadas por pulos possíveis.
+
+    Uma ligação a -> b existe se algum pulo saindo de `a` encosta em `b`
+    caindo com o pé entre o topo e a base + LANDING_SLACK, que é quando o
+    Player.update põe o jogador em cima dela. O jogador anda de STEP_X em
+    STEP_X, então a saída mais perto da beira com que dá para contar é a
+    STEP_X px dela; no ar ele anda até STEP_X por passo. Sem colisão lateral no
+    jogo, plataformas no meio do caminho não bloqueiam o pulo. Só conta
+    pulos para frente (a câmera não deixa voltar).
+    """
+    def __init__(self, layout):
+        order = sorted(range(len(layout['platforms'])), key=lambda i: layout['platforms'][i][0])
+        self.platforms = [pygame.Rect(layout['platforms'][i]) for i in order]
+        self.lefts = [p.left for p in self.platforms]
+        self.goal = len(self.platforms) - 1
+        if layout['flag']:
+            flag_x = layout['flag'][0]
+            self.goal = max(bisect_right(self.lefts, flag_x) - 1, 0)
+
+        max_reach = max(len(jump_arc(p.top)) for p in self.platforms) * STEP_X + PLAYER_W
+        self.edges = []
+        for a, A in enumerate(self.platforms):
+            end = bisect_right(self.lefts, A.right + max_reach)
+            self.edges.append([b for b in range(a + 1, end) if self.can_jump(A, self.platforms[b])])
+
+        self.reachable = self.search(0, self.edges)
+        back = [[] for _ in self.platforms]
+        for a, targets in enumerate(self.edges):
+            for b in targets:
+                back[b].append(a)
+        self.to_goal = self.search(self.goal, back)
+
+    @staticmethod
+    def can_jump(A, B):
+        for t, (bottom, vel) in enumerate(jump_arc(A.top), 1):
+            if vel < 0 or not B.top < bottom < B.bottom + LANDING_SLACK:
+                continue
+            reach = t * STEP_X
+            if A.right - STEP_X + reach > B.left - PLAYER_W and A.left - PLAYER_W + STEP_X - reach < B.right:
+                return True
+        return False
+
+    @staticmethod
+    def search(start, edges):
+        seen = {start}
+        stack = [start]
+        while stack:
+            for b in edges[stack.pop()]:
+                if b not in seen:
+                    seen.add(b)
+                    stack.append(b)
+        return seen
+
+    @property
+    def beatable(self):
+        return self.goal in self.reachable
+
+    def blocker(self):
+        """(índice, motivo) da primeira plataforma fora de alcance, ou None."""
+        if self.beatable:
+            return None
+        for b, B in enumerate(self.platforms):
+            if b in self.reachable:
+                continue
+            A = self.platforms[max(a for a in self.reachable if a < b)]
+            # Alta demais: nem parado embaixo dela o pulo pousa
+            high = all(vel < 0 or bottom >= B.bottom + LANDING_SLACK for bottom, vel in jump_arc(A.top))
+            return b, 'altura' if high else 'distância'
+        return None
+
+    def standing_on(self, rect):
+        i = bisect_right(self.lefts, rect.right - 1) - 1
+        for j in (i, i - 1):
+            if j >= 0:
+                p = self.platforms[j]
+                if p.top == rect.bottom and p.left < rect.right and rect.left < p.right:
+                    return j
+        return None
+
+    def next_hop(self, here):
+        """Próxima plataforma do caminho até a bandeira, ou None."""
+        for b in self.edges[here]:
+            if b in self.to_goal:
+                return b
+        return None
+
+class PlaytestBot:
+    """Corre para a direita atirando e pula na beira da plataforma.
+
+    No chão escolhe a próxima plataforma que leva à bandeira; no último
+    passo antes de sair da plataforma atual, pula. No ar, só segura a
+    direita até estar em cima do alvo. Com um inimigo na linha de tiro
+    logo à frente ou no caminho do pulo, para e atira (até BOT_PATIENCE
+    passos).
+    """
+    def __init__(self, check):
+        self.check = check
+        self.target = None
+        self.waited = 0
+        self.weapon = [w.name for w in WEAPONS].index(BOT_WEAPON)
+
+    def enemy_ahead(self, rect, enemies):
+        reach = rect.right + BOT_LOOKAHEAD
+        for enemy in enemies:
+            r = enemy.rect
+            if rect.left < r.right and r.left < reach and r.top <= rect.centery <= r.bottom:
+                return True
+        return False
+
+    def path_blocked(self, rect, A, enemies):
+        """Algum inimigo no espaço que o pulo de A até o alvo atravessa?"""
+        B = self.check.platforms[self.target]
+        apex = min(bottom for bottom, vel in jump_arc(A.top)) - PLAYER_H
+        path = pygame.Rect(rect.left, apex, B.left + 2 * PLAYER_W - rect.left, A.top - apex)
+        return any(path.colliderect(enemy.rect) for enemy in enemies)
+
+    def inputs(self, game):
+        if game.player.weapon_index != self.weapon:
+            # Pelo mesmo caminho do botão de arma, para entrar nos replays
+            game.pending_actions |= ACT_WEAPON
+        rect = game.player.rect
+        if game.player.on_ground:
+            if self.waited < BOT_PATIENCE and self.enemy_ahead(rect, game.active_enemies):
+                self.waited += 1
+                return False, False, False, True
+            self.waited = 0
+            here = self.check.standing_on(rect)
+            if here is not None:
+                self.target = self.check.next_hop(here)
+                if self.target is None:
+                    return False, True, False, True
+                A = self.check.platforms[here]
+                if rect.left + STEP_X < A.right:
+                    return False, True, False, True
+                # Na beira: espera o ar limpar (pomba/guarda-chuva empurram o jogador de volta)
+                if self.waited < BOT_PATIENCE and self.path_blocked(rect, A, game.active_enemies):
+                    self.waited += 1
+                    return False, False, False, True
+                return False, True, True, True
+        if self.target is None:
+            return False, True, False, True
+        B = self.check.platforms[self.target]
+        aim = min(B.left + PLAYER_W // 2, B.right - PLAYER_W)
+        return False, rect.left < aim, False, True
+
+MANAGER = LevelManager(None)
+_game = None
+
+def worker_game():
+    global _game
+    if _game is None:
+        from main import Game
+        _game = Game()
+    return _game
+
+def play_level(game, difficulty, seed, layout, check, max_steps):
+    """Joga a fase com o robô. Devolve (resultado, passos)."""
+    game.game_mode = 'mission'
+    game.level = difficulty
+    game.level_seeds[difficulty] = seed
+    # Layout já gerado: não passa pelo cache em disco (milhares de arquivos)
+    game.level_manager.layouts[(seed, difficulty, WIDTH, HEIGHT)] = layout
+    # Mesmo começo em qualquer processo, seja qual for a fase jogada antes
+    random.seed(seed)
+    SIM_CLOCK.restore((0, 0.0))
+    game.last_shot_time = 0
+    game.new_game()
+    game.level_manager.layouts.clear()
+
+    bot = PlaytestBot(check)
+    step = 0
+    while step < max_steps and game.state == 'PLAYING':
+        step += 1
+        game.apply_input(*bot.inputs(game))
+        game.update()
+
+    player = game.player
+    if game.state == 'PLAYING':
+        return 'tempo', step
+    if player.rect.top > HEIGHT:
+        return 'caiu', step
+    if player.hp <= 0:
+        return 'morreu', step
+    return 'bandeira', step
+
+def evaluate(task):
+    difficulty, seed, use_bot, max_steps = task
+    start = time.perf_counter()
+    layout = MANAGER.generate_layout(difficulty, seed)
+    check = LevelCheck(layout)
+    blocker = check.blocker()
+    result = {
+        'difficulty': difficulty,
+        'seed': seed,
+        'beatable': check.beatable,
+        'blocked_at': blocker[0] if blocker else None,
+        'reason': blocker[1] if blocker else None,
+        'check_seconds': time.perf_counter() - start,
+    }
+    if use_bot:
+        start = time.perf_counter()
+        outcome, steps = play_level(worker_game(), difficulty, seed, layout, check, max_steps)
+        result.update(outcome=outcome, steps=steps, bot_seconds=time.perf_counter() - start)
+    return result
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+def report(results, difficulties, elapsed, jobs):
+    rise, reach = jump_limits()
+    print(f"Pulo: sobe {rise} px, alcança {reach} px no mesmo nível, {STEP_X} px/passo "
+          f"(plataforma pega até {LANDING_SLACK} px abaixo da base)")
+    for d in difficulties:
+        rows = [r for r in results if r['difficulty'] == d]
+        if not rows:
+            continue
+        stuck = [r for r in rows if not r['beatable']]
+        reasons = {}
+        for r in stuck:
+            reasons[r['reason']] = reasons.get(r['reason'], 0) + 1
+        line = f"Dificuldade {d}: {len(rows)} sementes, {100 * len(stuck) / len(rows):.1f}% sem solução"
+        if reasons:
+            line += " (" + ", ".join(f"{k} {v}" for k, v in sorted(reasons.items())) + ")"
+        print(line)
+
+        played = [r for r in rows if 'outcome' in r]
+        if not played:
+            continue
+        outcomes = {}
+        for r in played:
+            outcomes[r['outcome']] = outcomes.get(r['outcome'], 0) + 1
+        print("  robô: " + ", ".join(f"{k} {100 * v / len(played):.1f}%" for k, v in sorted(outcomes.items()))
+              + f" em {len(played)} jogadas")
+        # Falhas do robô numa fase com solução: candidatas a fase difícil (ou robô burro)
+        missed = sum(1 for r in played if r['beatable'] and r['outcome'] != 'bandeira')
+        if missed:
+            print(f"  robô falhou em {missed} fases com solução")
+        times = [r['steps'] / SIM_FPS for r in played if r['outcome'] == 'bandeira']
+        if times:
+            print(f"  tempo até a bandeira: p10 {percentile(times, 0.1):.1f}s  p50 {percentile(times, 0.5):.1f}s  "
+                  f"p90 {percentile(times, 0.9):.1f}s  máx {max(times):.1f}s")
+
+    checked = len(results)
+    steps = sum(r.get('steps', 0) for r in results)
+    bot_cpu = sum(r.get('bot_seconds', 0.0) for r in results)
+    check_cpu = sum(r['check_seconds'] for r in results)
+    print(f"{checked} sementes em {elapsed:.1f}s com {jobs} processos -> {checked / elapsed:.0f} sementes/s")
+    if check_cpu:
+        print(f"  conta de alcance: {checked / check_cpu:.0f} sementes/s por processo")
+    if bot_cpu:
+        print(f"  robô: {steps / bot_cpu:.0f} passos/s por processo")
+
+def parse_levels(text):
+    levels = []
+    for part in text.split(','):
+        if '-' in part:
+            lo, hi = part.split('-')
+            levels.extend(range(int(lo), int(hi) + 1))
+        else:
+            levels.append(int(part))
+    return levels
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--levels', default='1-5', help='dificuldades, ex: 1-5 ou 2,4')
+    parser.add_argument('--seeds', type=int, default=2000, help='sementes por dificuldade')
+    parser.add_argument('--first-seed', type=int, default=0)
+    parser.add_argument('--bot', type=int, default=200, help='quantas dessas sementes o robô joga')
+    parser.add_argument('--max-seconds', type=int, default=180, help='tempo de jogo máximo por fase')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--save', metavar='ARQUIVO', help='salva o resultado de cada semente em JSON')
+    args = parser.parse_args(argv)
+
+    difficulties = parse_levels(args.levels)
+    max_steps = args.max_seconds * SIM_FPS
+    tasks = [(d, seed, i < args.bot, max_steps)
+             for d in difficulties
+             for i, seed in enumerate(range(args.first_seed, args.first_seed + args.seeds))]
+    # Fases jogadas primeiro: são as tarefas longas, o resto preenche os processos
+    tasks.sort(key=lambda task: not task[2])
+
+    start = time.perf_counter()
+    if args.jobs > 1:
+        with ProcessPoolExecutor(args.jobs) as pool:
+            results = list(pool.map(evaluate, tasks, chunksize=4))
+    else:
+        results = [evaluate(task) for task in tasks]
+    elapsed = time.perf_counter() - start
+
+    results.sort(key=lambda r: (r['difficulty'], r['seed']))
+    report(results, difficulties, elapsed, args.jobs)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=1)
+        print(f"Resultados salvos: {args.save}")
+    return results
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,64 @@
+from settings import *
+
+class SpritePool:
+    """Reaproveita sprites de vida curta (tiros, explosões).
+
+    `acquire` devolve um sprite livre reiniciado com `reset(*args)` ou cria
+    um novo com `factory(*args)`. Sprites com `self.pool` voltam sozinhos
+    para cá no `kill()`. Guarda no máximo `cap` livres; o resto é liberado
+    para o coletor de lixo.
+    """
+    def __init__(self, factory, cap=32):
+        self.factory = factory
+        self.cap = cap
+        self.free = []
+        self.created = 0
+        self.reused = 0
+        self.grown = 0
+        self.discarded = 0
+
+    def prewarm(self, count, *args):
+        for _ in range(min(count, self.cap) - len(self.free)):
+            sprite = self.factory(*args)
+            sprite.pool = self
+            self.created += 1
+            self.free.append(sprite)
+
+    def acquire(self, *args):
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args)
+            self.reused += 1
+        else:
+            # Pool vazio: precisa crescer
+            sprite = self.factory(*args)
+            sprite.pool = self
+            self.created += 1
+            self.grown += 1
+        return sprite
+
+    def release(self, sprite):
+        if len(self.free) < self.cap:
+            self.free.append(sprite)
+        else:
+            self.discarded += 1
+
+    def stats(self):
+        return {
+            'created': self.created,
+            'reused': self.reused,
+            'grown': self.grown,
+            'discarded': self.discarded,
+            'free': len(self.free),
+        }
+
+class PooledSprite:
+    """Mixin: no `kill()` o sprite volta para o pool de onde saiu."""
+    pool = None
+
+    def kill(self):
+        was_alive = self.alive()
+        super().kill()
+        # Evita devolver duas vezes (ex: kill chamado de novo no mesmo frame)
+        if was_alive and self.pool is not None:
+            self.pool.release(self)
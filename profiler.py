@@ -0,0 +1,103 @@
+import sys
+import csv
+import json
+import time
+from collections import deque
+from settings import *
+
+class FrameProfiler:
+    """Mede quanto cada fase do frame custou.
+
+    O frame é dividido em voltas sequenciais: `lap('events')` guarda o tempo
+    desde a volta anterior com esse nome. Fases repetidas no mesmo frame
+    (vários passos de update) são somadas. `end_frame()` fecha o frame e
+    junta contagens de sprites e blocos de memória alocados.
+
+    Desligado, cada volta é só um `if`; ligado, guarda os últimos `history`
+    frames para min/média/p99 e para exportar em CSV ou JSON.
+    """
+    def __init__(self, history=600, enabled=False):
+        self.enabled = enabled
+        self.frames = deque(maxlen=history)
+        self.phases = []
+        self.current = {}
+        self.counts = {}
+        self._last = 0.0
+        self._frame_start = 0.0
+        self._blocks = 0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.frames.clear()
+        self.begin_frame()
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.current = {}
+        self._frame_start = self._last = time.perf_counter()
+        self._blocks = sys.getallocatedblocks()
+
+    def lap(self, phase):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.current[phase] = self.current.get(phase, 0.0) + (now - self._last) * 1000
+        self._last = now
+        if phase not in self.phases:
+            self.phases.append(phase)
+
+    def count(self, name, value):
+        if self.enabled:
+            self.counts[name] = value
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        frame = dict(self.current)
+        frame['total'] = (time.perf_counter() - self._frame_start) * 1000
+        # Diferença de blocos vivos: positivo = o frame deixou lixo/objetos novos
+        frame['alloc_blocks'] = sys.getallocatedblocks() - self._blocks
+        frame.update(self.counts)
+        self.frames.append(frame)
+
+    def summary(self):
+        """{fase: (min, média, p99)} em ms nos frames guardados."""
+        result = {}
+        for phase in self.phases + ['total', 'alloc_blocks']:
+            values = sorted(f.get(phase, 0.0) for f in self.frames)
+            if not values:
+                continue
+            p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+            result[phase] = (values[0], sum(values) / len(values), p99)
+        return result
+
+    def columns(self):
+        return self.phases + ['total', 'alloc_blocks'] + list(self.counts)
+
+    def export(self, path):
+        """Salva os frames guardados: .csv (uma linha por frame) ou .json."""
+        frames = list(self.frames)
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=self.columns(), restval=0)
+                writer.writeheader()
+                writer.writerows(frames)
+        else:
+            with open(path, 'w') as f:
+                json.dump({'summary': self.summary(), 'frames': frames}, f, indent=1)
+        return len(frames)
+
+    def overlay_lines(self):
+        lines = []
+        for phase, (lo, avg, p99) in self.summary().items():
+            if phase == 'alloc_blocks':
+                lines.append(f"alloc  {avg:+.0f} blocos/frame (p99 {p99:+.0f})")
+            else:
+                lines.append(f"{phase:<14} {lo:5.2f} {avg:5.2f} {p99:5.2f} ms")
+        if self.counts:
+            lines.append(" ".join(f"{k}:{v}" for k, v in self.counts.items()))
+        return lines
+
+# Instância única usada por todo o jogo (desligada até F3 / três dedos)
+PROFILER = FrameProfiler(enabled=os.environ.get('SUPERPUG_PROFILE', '') not in ('', '0'))
@@ -0,0 +1,231 @@
+"""Gravação e reprodução das entradas de uma partida.
+
+Uso:
+    SUPERPUG_RECORD=1 python main.py          # grava cada fase em cache/replays/
+    python replay.py cache/replays/f2_s5_0001.sprp --render
+
+A reprodução roda sem tela e sem limite de FPS, passo a passo com as
+mesmas entradas, e confere os pontos de controle gravados (posição,
+vida e pontuação do jogador). Serve de benchmark (o mesmo trecho medido
+em versões diferentes) e de teste de regressão.
+
+Formato: uma linha JSON de cabeçalho e depois um byte por passo de
+simulação (bits LEFT, RIGHT, UP, FIRE e ACT_*), comprimido com zlib.
+"""
+import os
+import sys
+import json
+import time
+import zlib
+import random
+import argparse
+
+# Bits de cada passo
+LEFT = 1
+RIGHT = 2
+UP = 4
+FIRE = 8
+# Ações de um passo só (vêm de toques/teclas, não de botões segurados)
+ACT_JUMP = 16
+ACT_WEAPON = 32
+ACT_CHAR = 64
+ACT_RETRY = 128
+
+MAGIC = 'superpug-replay'
+REPLAY_VERSION = 1
+# A cada quantos passos guarda um ponto de controle do estado
+CHECK_EVERY = 60
+
+def encode(left, right, up, fire, actions=0):
+    return (LEFT if left else 0) | (RIGHT if right else 0) | (UP if up else 0) | (FIRE if fire else 0) | actions
+
+def decode(mask):
+    """(esq, dir, pulo, tiro) e as ações de um passo só."""
+    return (bool(mask & LEFT), bool(mask & RIGHT), bool(mask & UP), bool(mask & FIRE)), mask & ~0xF
+
+def checksum(game):
+    p = game.player
+    return zlib.crc32(repr((p.rect.x, p.rect.y, p.hp, game.total_score)).encode())
+
+def session_state(game):
+    """Tudo fora da fase que influencia a simulação a partir de new_game."""
+    from sim_clock import SIM_CLOCK
+    return {
+        'random': _to_json(random.getstate()),
+        'clock': list(SIM_CLOCK.state()),
+        'last_shot_time': game.last_shot_time,
+    }
+
+def restore_session(game, state):
+    from sim_clock import SIM_CLOCK
+    random.setstate(_from_json(state['random']))
+    SIM_CLOCK.restore(tuple(state['clock']))
+    game.last_shot_time = state['last_shot_time']
+
+def _to_json(value):
+    if isinstance(value, tuple):
+        return {'t': [_to_json(v) for v in value]}
+    return value
+
+def _from_json(value):
+    if isinstance(value, dict):
+        return tuple(_from_json(v) for v in value['t'])
+    return value
+
+class InputRecorder:
+    """Grava as entradas aplicadas a cada passo de uma fase."""
+    def __init__(self, game, path):
+        from settings import WIDTH, HEIGHT, SIM_FPS
+        self.game = game
+        self.path = path
+        self.masks = bytearray()
+        self.checks = []
+        self.header = {
+            'magic': MAGIC,
+            'version': REPLAY_VERSION,
+            'resolution': [WIDTH, HEIGHT],
+            'sim_fps': SIM_FPS,
+            'mode': game.game_mode,
+            'level': game.level,
+            'seed': game.level_seeds[game.level],
+            'total_score': game.total_score,
+            'session': session_state(game),
+        }
+
+    def set_backends(self, game):
+        # Lotes NumPy e sprites dão o mesmo jogo, mas sorteiam em ordens diferentes
+        self.header['entities'] = 'numpy' if game.batches else 'sprites'
+        self.header['bullets'] = 'sprites' if hasattr(game.bullets, 'group') else 'numpy'
+
+    def record(self, mask):
+        self.masks.append(mask)
+
+    def check(self):
+        # Chamado depois do update: estado ao fim do passo len(masks). Sem
+        # passos, o recorder acabou de nascer num new_game dentro do update
+        # (bandeira da campanha) e ainda não há o que conferir
+        if self.masks and len(self.masks) % CHECK_EVERY == 0:
+            self.checks.append([len(self.masks), checksum(self.game)])
+
+    def save(self):
+        """Fecha a gravação e escreve o arquivo (se houver caminho)."""
+        self.header['steps'] = len(self.masks)
+        self.header['checks'] = self.checks
+        self.header['final'] = checksum(self.game)
+        if self.path is None:
+            return None
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'wb') as f:
+                f.write(json.dumps(self.header).encode() + b'\n')
+                f.write(zlib.compress(bytes(self.masks), 9))
+        except OSError as e:
+            print(f"Erro ao salvar replay: {e}")
+            return None
+        return self.path
+
+def load_replay(path):
+    with open(path, 'rb') as f:
+        header = json.loads(f.readline())
+        masks = zlib.decompress(f.read())
+    if header.get('magic') != MAGIC or header.get('version') != REPLAY_VERSION:
+        raise ValueError(f"{path} não é um replay compatível")
+    return header, masks
+
+def start_game(game, header):
+    """Coloca o jogo no mesmo ponto em que a gravação começou."""
+    game.game_mode = header['mode']
+    game.level = header['level']
+    game.level_seeds[header['level']] = header['seed']
+    game.total_score = header['total_score']
+    restore_session(game, header['session'])
+    game.new_game()
+
+def play(game, header, masks, render=False):
+    """Reproduz as entradas. Devolve um dict com tempos e o primeiro passo divergente.
+
+    O jogo regrava a partida na memória enquanto reproduz; no fim os
+    pontos de controle das duas gravações são comparados.
+    """
+    from profiler import PROFILER
+    game.record_replays = True
+    game.replay_folder = None
+    start_game(game, header)
+    rec = game.recorder
+    for key in ('resolution', 'entities', 'bullets'):
+        if rec.header[key] != header[key]:
+            # Jogo já importado com outro ambiente (ex: pelo bench.py)
+            print(f"Aviso: {key} {rec.header[key]} diferente da gravação ({header[key]})")
+    step = 0
+    clock = time.perf_counter
+    update_s = draw_s = 0.0
+    start = clock()
+    for step, mask in enumerate(masks, 1):
+        pressed, actions = decode(mask)
+        game.pending_actions |= actions
+        t0 = clock()
+        PROFILER.begin_frame()
+        game.apply_input(*pressed)
+        game.update()
+        t1 = clock()
+        if render:
+            game.draw()
+        t2 = clock()
+        if PROFILER.enabled:
+            game.profile_counts()
+            PROFILER.end_frame()
+        update_s += t1 - t0
+        draw_s += t2 - t1
+        if game.recorder is not rec:
+            break
+    elapsed = clock() - start
+    if game.recorder is rec:
+        game.stop_recording()
+
+    # Compara pelo número do passo, não pela posição na lista
+    replayed = dict(rec.checks)
+    diverged = None
+    for step_a, crc_a in header['checks']:
+        if step_a in replayed and replayed[step_a] != crc_a:
+            diverged = step_a
+            break
+    if diverged is None and (rec.header['steps'] != header['steps'] or rec.header['final'] != header['final']):
+        diverged = rec.header['steps']
+    step = max(step, 1)
+    return {
+        'steps': step,
+        'seconds': elapsed,
+        'steps_per_second': step / elapsed if elapsed else 0.0,
+        'phase_ms': {'update': update_s * 1000 / step, 'draw': draw_s * 1000 / step},
+        'diverged': diverged,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reproduz um replay sem tela e confere o resultado")
+    parser.add_argument('path')
+    parser.add_argument('--render', action='store_true', help='desenha cada passo numa superfície fora da tela')
+    args = parser.parse_args(argv)
+
+    # O ambiente tem que bater com o da gravação antes de importar o jogo
+    header, masks = load_replay(args.path)
+    os.environ.setdefault('SUPERPUG_HEADLESS', '1')
+    os.environ['SUPERPUG_RESOLUTION'] = 'x'.join(map(str, header['resolution']))
+    os.environ['SUPERPUG_ENTITIES'] = header['entities']
+    os.environ['SUPERPUG_BULLETS'] = header['bullets']
+    from main import Game
+
+    game = Game()
+    result = play(game, header, masks, args.render)
+    print(f"{result['steps']}/{header['steps']} passos em {result['seconds']:.2f}s "
+          f"-> {result['steps_per_second']:.0f} passos/s "
+          f"(fase {header['level']}, semente {header['seed']})")
+    for phase, ms in result['phase_ms'].items():
+        print(f"  {phase:<7} {ms:.3f} ms/passo")
+    if result['diverged'] is None:
+        print("OK: reprodução idêntica à gravação")
+    else:
+        print(f"DIVERGIU no passo {result['diverged']}")
+    return 0 if result['diverged'] is None else 1
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
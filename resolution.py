@@ -0,0 +1,78 @@
+import os
+import json
+
+# Não importa settings: é o settings que usa este módulo para decidir WIDTH/HEIGHT
+GAME_FOLDER = os.path.dirname(__file__)
+RESOLUTION_FILE = os.path.join(GAME_FOLDER, 'cache', 'render.json')
+
+# Alturas lógicas possíveis (px); None = resolução nativa da tela.
+# A largura sai da proporção da tela, então o toque não precisa de tarja preta.
+RENDER_TIERS = (None, 720, 540, 450)
+
+def load_render_height():
+    """Altura lógica escolhida: variável de ambiente, arquivo salvo ou nativa."""
+    env = os.environ.get('SUPERPUG_RENDER_HEIGHT', '').lower()
+    if env:
+        return None if env == 'native' else int(env)
+    try:
+        with open(RESOLUTION_FILE) as f:
+            return json.load(f).get('height')
+    except (OSError, ValueError):
+        return None
+
+def save_render_height(height):
+    try:
+        os.makedirs(os.path.dirname(RESOLUTION_FILE), exist_ok=True)
+        with open(RESOLUTION_FILE, 'w') as f:
+            json.dump({'height': height}, f)
+    except OSError as e:
+        print(f"Erro ao salvar resolução: {e}")
+
+def logical_size(native_w, native_h, height):
+    """Tamanho da superfície de desenho para a altura pedida (nunca maior que a tela)."""
+    if height is None or height >= native_h:
+        return native_w, native_h
+    return round(native_w * height / native_h), height
+
+class FrameBudget:
+    """Resolução dinâmica: mede o tempo de trabalho de cada frame e, se ficar
+    acima do orçamento por várias janelas seguidas, desce um degrau em
+    RENDER_TIERS.
+
+    Todo o jogo (SCALE, física, imagens) é calculado a partir de WIDTH/HEIGHT
+    na importação do settings, então o novo degrau é salvo e vale a partir da
+    próxima vez que o jogo abrir.
+    """
+    def __init__(self, budget_ms, current_height, window=180, strikes=3):
+        self.budget_ms = budget_ms
+        self.current_height = current_height
+        self.window = window
+        self.strikes = strikes
+        self.samples = []
+        self.over = 0
+        self.lowered_to = None
+
+    def next_tier(self):
+        for h in RENDER_TIERS:
+            if h is not None and h < self.current_height:
+                return h
+        return None
+
+    def sample(self, work_ms):
+        """Registra um frame; devolve a nova altura se decidiu baixar a resolução."""
+        if self.lowered_to is not None:
+            return None
+        self.samples.append(work_ms)
+        if len(self.samples) < self.window:
+            return None
+        avg = sum(self.samples) / len(self.samples)
+        self.samples = []
+        self.over = self.over + 1 if avg > self.budget_ms else 0
+        if self.over < self.strikes:
+            return None
+        lower = self.next_tier()
+        if lower is None:
+            return None
+        self.lowered_to = lower
+        save_render_height(lower)
+        return lower
@@ -0,0 +1,96 @@
+from settings import *
+from sim_clock import SIM_CLOCK
+
+class Timer:
+    """Chamada marcada na TimerWheel; `cancel()` desmarca."""
+    __slots__ = ('step', 'ticks', 'callback')
+
+    def __init__(self, step, ticks, callback):
+        self.step = step
+        self.ticks = ticks
+        self.callback = callback
+
+    def cancel(self):
+        self.callback = None
+
+    @property
+    def active(self):
+        return self.callback is not None
+
+class TimerWheel:
+    """Agenda chamadas para um instante do relógio da simulação.
+
+    Roda de `size` casas, uma por passo: o timer para o passo N fica na
+    casa N % size e `advance()` só olha a casa do passo atual, então o
+    custo por passo depende de quantos timers vencem, não de quantos
+    sprites existem. Timers mais longe que uma volta continuam na casa
+    até o passo deles chegar.
+
+    `call_at(ticks, fn)` chama `fn(agora)` no primeiro passo com
+    SIM_CLOCK.ticks >= ticks (o mesmo que `agora - último > espera` nos
+    timers antigos, com ticks = último + espera + 1). Se já venceu,
+    chama na hora.
+    """
+    def __init__(self, clock=SIM_CLOCK, size=128):
+        self.clock = clock
+        self.size = size
+        self.slots = [[] for _ in range(size)]
+        self.pending = 0
+        self.fired = 0
+
+    def call_at(self, ticks, callback):
+        clock = self.clock
+        if ticks <= clock.ticks:
+            callback(clock.ticks)
+            return None
+        # Estimativa por baixo do passo: o relógio soma frações de ms, então
+        # o passo exato é conferido no advance (e o timer adiado se cedo)
+        step = max(int(ticks / clock.step_ms), clock.steps + 1)
+        timer = Timer(step, ticks, callback)
+        self.slots[step % self.size].append(timer)
+        self.pending += 1
+        return timer
+
+    def advance(self):
+        """Roda os timers vencidos no passo atual. Devolve quantos rodaram."""
+        clock = self.clock
+        now = clock.ticks
+        slot = self.slots[clock.steps % self.size]
+        if not slot:
+            return 0
+        keep = []
+        due = []
+        for timer in slot:
+            if timer.callback is None:
+                self.pending -= 1
+            elif timer.step > clock.steps:
+                keep.append(timer)
+            elif timer.ticks > now:
+                # Estimativa cedo demais: tenta no próximo passo
+                timer.step = clock.steps + 1
+                self.slots[timer.step % self.size].append(timer)
+            else:
+                due.append(timer)
+        self.slots[clock.steps % self.size] = keep
+        for timer in due:
+            callback = timer.callback
+            # Pode ter sido cancelado por outro timer deste mesmo passo
+            if callback is not None:
+                timer.callback = None
+                callback(now)
+        self.pending -= len(due)
+        self.fired += len(due)
+        return len(due)
+
+    def clear(self):
+        for slot in self.slots:
+            for timer in slot:
+                timer.callback = None
+            slot.clear()
+        self.pending = 0
+
+    def __len__(self):
+        return self.pending
+
+# Instância única usada por todo o jogo (anda junto com o SIM_CLOCK)
+TIMERS = TimerWheel()
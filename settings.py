@@ -1,24 +1,64 @@
 import pygame
+import os
+from resolution import load_render_height, logical_size
+
+# --- MODO HEADLESS (benchmarks / testes sem tela) ---
+# SUPERPUG_HEADLESS=1 usa o driver de vídeo "dummy" do SDL e uma
+# resolução virtual fixa (SUPERPUG_RESOLUTION, padrão 800x450)
+HEADLESS = os.environ.get('SUPERPUG_HEADLESS', '') not in ('', '0')
+if HEADLESS:
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
 
 pygame.init()
 
-info = pygame.display.Info()
+if HEADLESS:
+    res_w, res_h = os.environ.get('SUPERPUG_RESOLUTION', '800x450').lower().split('x')
+    WIDTH, HEIGHT = int(res_w), int(res_h)
+    NATIVE_W, NATIVE_H = WIDTH, HEIGHT
+else:
+    info = pygame.display.Info()
+
+    # --- CORREÇÃO DE PAISAGEM ---
+    # Pega o maior valor para ser a largura (WIDTH) e o menor para altura (HEIGHT)
+    # Isso força o jogo a "pensar" deitado mesmo se o sensor falhar.
+    NATIVE_W = max(info.current_w, info.current_h)
+    NATIVE_H = min(info.current_w, info.current_h)
 
-# --- CORREÇÃO DE PAISAGEM ---
-# Pega o maior valor para ser a largura (WIDTH) e o menor para altura (HEIGHT)
-# Isso força o jogo a "pensar" deitado mesmo se o sensor falhar.
-WIDTH = max(info.current_w, info.current_h)
-HEIGHT = min(info.current_w, info.current_h)
+    # --- RESOLUÇÃO LÓGICA ---
+    # Em telas grandes o jogo pode desenhar numa superfície menor (ex: 450 de
+    # altura, a base do SCALE) e o SDL amplia na apresentação (pygame.SCALED).
+    # SUPERPUG_RENDER_HEIGHT=450 força uma altura; =native desliga.
+    RENDER_HEIGHT = load_render_height()
+    WIDTH, HEIGHT = logical_size(NATIVE_W, NATIVE_H, RENDER_HEIGHT)
 
 # Fator de Escala
 SCALE = WIDTH / 800 
 if SCALE < 1: SCALE = 1
 
-print(f"Resolução: {WIDTH}x{HEIGHT} | Escala: {SCALE:.2f}")
+# Desenha menor que a tela e amplia no final
+LOGICAL_RESOLUTION = (WIDTH, HEIGHT) != (NATIVE_W, NATIVE_H)
+# Baixa a resolução lógica (na próxima abertura) se os frames estourarem o tempo
+DYNAMIC_RESOLUTION = not HEADLESS
+
+print(f"Resolução: {WIDTH}x{HEIGHT} (tela {NATIVE_W}x{NATIVE_H}) | Escala: {SCALE:.2f}")
 
 TITLE = "Super Pug Game"
 FPS = 60
 
+# --- LAÇO DE TEMPO FIXO ---
+# A física roda sempre a SIM_FPS passos por segundo; a tela é desenhada
+# a RENDER_FPS (ex: 30 em celulares fracos) com posições interpoladas
+SIM_FPS = 60
+RENDER_FPS = int(os.environ.get('SUPERPUG_RENDER_FPS', FPS))
+# Máximo de passos de simulação para "alcançar" o tempo num único frame
+MAX_CATCHUP_STEPS = 5
+# Menus só redesenham quando algo muda; sem eventos, o laço dorme até
+# MENU_IDLE_TIMEOUT ms esperando um toque (economiza bateria)
+MENU_IDLE_TIMEOUT = 1000
+# Tempo mínimo (ms) da tela "NIVEL X COMPLETO" enquanto a próxima fase carrega
+LEVEL_SCREEN_MIN_MS = 1200
+
 # --- FÍSICA ---
 PLAYER_SPEED = 8 * SCALE
 GRAVITY = 0.8 * SCALE
@@ -31,3 +71,46 @@ RED = (255, 0, 0)
 GREEN = (0, 255, 0)
 BLUE = (0, 0, 255)
 BROWN = (101, 67, 33)
+
+# --- PACOTE DE IMAGENS ---
+# Guarda em cache/assets_LxA.pack as imagens já escaladas para esta resolução
+# (SUPERPUG_ASSET_PACK=0 desliga e sempre lê os PNGs)
+ASSET_PACK = os.environ.get('SUPERPUG_ASSET_PACK', '1') != '0'
+# Junta as imagens pequenas dos sprites num atlas (SUPERPUG_ATLAS=0 desliga)
+USE_ATLAS = os.environ.get('SUPERPUG_ATLAS', '1') != '0'
+
+# --- REPLAYS ---
+# SUPERPUG_RECORD=1 grava as entradas de cada fase em cache/replays/ (veja replay.py)
+RECORD_REPLAYS = os.environ.get('SUPERPUG_RECORD', '') not in ('', '0')
+REPLAY_FOLDER = os.path.join(os.path.dirname(__file__), 'cache', 'replays')
+
+# --- POOLS DE OBJETOS ---
+# Quantos tiros/explosões livres cada pool guarda para reaproveitar
+POOL_CAPS = {'bullet': 24, 'explosion': 8}
+
+# --- TIROS ---
+# 'auto' usa os tiros em arrays NumPy se o numpy estiver instalado,
+# 'numpy' exige o numpy e 'sprites' força um sprite por tiro
+BULLET_BACKEND = os.environ.get('SUPERPUG_BULLETS', 'auto')
+
+# --- INIMIGOS E OSSOS ---
+# 'auto' atualiza inimigos e ossos em lote com NumPy se houver numpy,
+# 'numpy' exige o numpy e 'sprites' usa o update() de cada sprite
+ENTITY_BACKEND = os.environ.get('SUPERPUG_ENTITIES', 'auto')
+
+# --- REGIÃO ATIVA ---
+# Inimigos, ossos e plataformas só são atualizados/desenhados
+# se estiverem a menos desta distância (em px) da tela
+ACTIVE_MARGIN = WIDTH // 2
+
+# Largura (px) de cada coluna do índice de colisão das plataformas
+GRID_CELL = int(250 * SCALE)
+
+# --- MODO INFINITO ---
+# Gera a fase até esta distância à frente da tela e libera o que ficou
+# esta distância para trás
+STREAM_AHEAD = WIDTH * 2
+STREAM_BEHIND = WIDTH
+# A dificuldade sobe 1 ponto a cada ENDLESS_RAMP px percorridos
+ENDLESS_RAMP = int(20000 * SCALE)
+ENDLESS_MAX_DIFFICULTY = 6
@@ -0,0 +1,29 @@
+from settings import *
+
+class SimClock:
+    """Relógio da simulação, em milissegundos.
+
+    Anda um passo fixo (1000 / SIM_FPS) a cada Game.update, então os
+    timers dos sprites seguem a física e não o relógio real: se o jogo
+    desenhar a 30 FPS, a simulação continua a 60 passos por segundo.
+    """
+    def __init__(self, rate=SIM_FPS):
+        self.step_ms = 1000.0 / rate
+        self.ticks = 0
+        self.steps = 0
+        self._time = 0.0
+
+    def advance(self):
+        self.steps += 1
+        self._time += self.step_ms
+        self.ticks = int(self._time)
+
+    def state(self):
+        return (self.steps, self._time)
+
+    def restore(self, state):
+        self.steps, self._time = state
+        self.ticks = int(self._time)
+
+# Instância única usada por todo o jogo
+SIM_CLOCK = SimClock()
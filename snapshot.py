@@ -0,0 +1,90 @@
+import random
+from settings import *
+from sim_clock import SIM_CLOCK
+from scheduler import TIMERS
+
+class WorldSnapshot:
+    """Foto do estado de uma fase para voltar a ela sem reconstruir nada.
+
+    Guarda, para cada sprite da fase, o grupo, a posição e os atributos
+    listados em `SNAPSHOT` na classe do sprite (vida, direção, timers...),
+    além do jogador, dos tiros no ar, da câmera, da pontuação, do relógio
+    da simulação e das sementes aleatórias (explosões não entram).
+    `restore` reaproveita os mesmos objetos: quem morreu volta para os
+    grupos e todos voltam a dormir na região ativa, como logo depois do
+    `create_level`.
+
+    Não serve para o modo infinito, que cria e destrói trechos da fase.
+    """
+    def __init__(self, game):
+        # Sprites acordados em lote podem estar com o estado só nos arrays
+        for batch in game.batches:
+            batch.flush()
+
+        self.sprites = []
+        for group in (game.platforms, game.bones, game.enemies, game.flags):
+            for sprite in group:
+                self.sprites.append((sprite, group, sprite.rect.topleft, self.values(sprite)))
+        self.members = {entry[0] for entry in self.sprites}
+
+        player = game.player
+        self.player = (player.rect.topleft, self.values(player))
+        self.camera_x = game.camera.x
+        self.total_score = game.total_score
+        self.last_shot_time = game.last_shot_time
+        self.bullets = game.bullets.state()
+        self.bullets_enemy = game.bullets_enemy.state()
+        self.clock = SIM_CLOCK.state()
+        self.random_state = random.getstate()
+        self.batch_rngs = [batch.rng.bit_generator.state for batch in game.batches if hasattr(batch, 'rng')]
+
+    @staticmethod
+    def values(sprite):
+        return tuple(getattr(sprite, name) for name in sprite.SNAPSHOT)
+
+    @staticmethod
+    def apply(sprite, topleft, values):
+        sprite.rect.topleft = topleft
+        for name, value in zip(sprite.SNAPSHOT, values):
+            setattr(sprite, name, value)
+
+    def restore(self, game):
+        game.bullets.restore(self.bullets)
+        game.bullets_enemy.restore(self.bullets_enemy)
+        for sprite in game.effects.sprites():
+            sprite.kill()
+
+        # Esvazia a região antes de mexer nos sprites: os lotes devolvem o
+        # estado deles ao sair e isso não pode sobrescrever a foto
+        game.region.clear()
+        for group in (game.platforms, game.bones, game.enemies, game.flags):
+            for sprite in group.sprites():
+                if sprite not in self.members:
+                    sprite.kill()
+
+        for sprite, group, topleft, values in self.sprites:
+            self.apply(sprite, topleft, values)
+            sprite.add(game.all_sprites, group)
+            game.region.add(sprite)
+
+        topleft, values = self.player
+        self.apply(game.player, topleft, values)
+        game.all_sprites.add(game.player)
+
+        game.camera.reset()
+        game.camera.x = game.camera.prev_x = self.camera_x
+        game.total_score = self.total_score
+        game.last_shot_time = self.last_shot_time
+        SIM_CLOCK.restore(self.clock)
+        # Timers não entram na foto: quem usa timer marca de novo pelo próprio
+        # estado (last_shot, last_frame_update...) no próximo update
+        TIMERS.clear()
+        for sprite in self.members | {game.player}:
+            if getattr(sprite, 'timer', None) is not None:
+                sprite.timer = None
+        random.setstate(self.random_state)
+        rngs = iter(self.batch_rngs)
+        for batch in game.batches:
+            if hasattr(batch, 'rng'):
+                batch.rng.bit_generator.state = next(rngs)
+        game.state = 'PLAYING'
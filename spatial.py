@@ -0,0 +1,56 @@
+import pygame
+from settings import *
+
+class SpatialGroup(pygame.sprite.Group):
+    """Grupo com índice em colunas (grade uniforme no eixo x).
+
+    A fase é comprida e baixa, então basta dividir o mundo em colunas de
+    `cell_size` px. Cada sprite fica nas colunas que seu rect cobre e a
+    colisão só testa quem está nas mesmas colunas, em vez do grupo todo.
+    O índice é atualizado sozinho quando sprites entram ou saem (kill).
+    """
+    def __init__(self, *sprites, cell_size=GRID_CELL):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.sprite_cells = {}
+        super().__init__(*sprites)
+
+    def _columns(self, rect):
+        return range(rect.left // self.cell_size, rect.right // self.cell_size + 1)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite)
+        if sprite in self.sprite_cells:
+            return
+        cols = self._columns(sprite.rect)
+        for col in cols:
+            self.cells.setdefault(col, []).append(sprite)
+        self.sprite_cells[sprite] = cols
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        cols = self.sprite_cells.pop(sprite, ())
+        for col in cols:
+            bucket = self.cells[col]
+            bucket.remove(sprite)
+            if not bucket:
+                del self.cells[col]
+
+    def move(self, sprite):
+        """Reindexa um sprite que mudou de lugar."""
+        if sprite in self.sprite_cells:
+            self.remove_internal(sprite)
+            self.add_internal(sprite)
+
+    def query(self, rect):
+        """Sprites das colunas que `rect` cobre (candidatos, sem teste fino)."""
+        found = {}
+        for col in self._columns(rect):
+            for sprite in self.cells.get(col, ()):
+                found[sprite] = None
+        return found.keys()
+
+    def collide(self, sprite):
+        """Equivalente a spritecollide(sprite, grupo, False) usando o índice."""
+        rect = sprite.rect
+        return [s for s in self.query(rect) if rect.colliderect(s.rect)]
@@ -3,12 +3,20 @@ import os
 import random
 import math 
 from settings import *
-from weapons import EnemyProjectile
+from pool import PooledSprite
+from weapons import PIGEON_DROPPING
+from asset_cache import ASSETS, ASSETS_FOLDER
+from sim_clock import SIM_CLOCK
+from scheduler import TIMERS
 
-GAME_FOLDER = os.path.dirname(__file__)
-ASSETS_FOLDER = os.path.join(GAME_FOLDER, 'assets')
+def player_size():
+    return (int(60 * SCALE), int(50 * SCALE))
 
 class Player(pygame.sprite.Sprite):
+    # Atributos guardados numa foto da fase (snapshot.WorldSnapshot), além da posição
+    SNAPSHOT = ('hp', 'vel_y', 'on_ground', 'is_moving', 'facing_right', 'frame_index',
+                'last_frame_update', 'weapon_index', 'char_index', 'image')
+
     def __init__(self, game):
         super().__init__()
         self.game = game
@@ -18,13 +26,17 @@ class Player(pygame.sprite.Sprite):
         
         self.hp = 100
         self.max_hp = 100
-        self.size = (int(60 * SCALE), int(50 * SCALE))
+        self.size = player_size()
 
         # --- SISTEMA DE ANIMAÇÃO ---
-        self.animation_db = {} # Dicionário que guarda LISTAS de frames
+        # Dicionário que guarda, por personagem, (frames_esquerda, frames_direita)
+        # já espelhados no carregamento: basta indexar com facing_right
+        self.animation_db = {}
         self.frame_index = 0   # Qual frame da lista estamos mostrando agora
         self.animation_speed = 150 # Velocidade da troca em milissegundos (quanto menor, mais rápido)
-        self.last_frame_update = pygame.time.get_ticks()
+        self.last_frame_update = SIM_CLOCK.ticks
+        # Próxima troca de frame marcada na TIMERS (None = nada marcado)
+        self.timer = None
         
         # Tenta carregar 4 frames de caminhada para cada personagem
         num_frames_to_load = 4 
@@ -34,13 +46,15 @@ class Player(pygame.sprite.Sprite):
             loaded_walking = False
             
             # 1. Tenta carregar a sequência: nome_walk1.png, nome_walk2.png, etc.
+            frames_left = []
             for i in range(1, num_frames_to_load + 1):
-                path = os.path.join(ASSETS_FOLDER, f'{name}_walk{i}.png')
+                fname = f'{name}_walk{i}.png'
+                path = os.path.join(ASSETS_FOLDER, fname)
                 if os.path.exists(path):
                     try:
-                        img = pygame.image.load(path).convert_alpha()
-                        img = pygame.transform.scale(img, self.size)
+                        img = ASSETS.get(fname, self.size)
                         frames.append(img)
+                        frames_left.append(ASSETS.get(fname, self.size, flip=True))
                         loaded_walking = True
                     except:
                         print(f"Erro ao carregar frame: {path}")
@@ -49,24 +63,26 @@ class Player(pygame.sprite.Sprite):
             if not frames or not loaded_walking:
                 print(f"Aviso: Animação não encontrada para {name}. Usando imagem estática.")
                 frames = [] # Garante lista limpa
-                path_static = os.path.join(ASSETS_FOLDER, f'{name}.png')
+                frames_left = []
                 try:
-                    img = pygame.image.load(path_static).convert_alpha()
-                    img = pygame.transform.scale(img, self.size)
+                    img = ASSETS.get(f'{name}.png', self.size)
+                    img_left = ASSETS.get(f'{name}.png', self.size, flip=True)
                     # Adiciona a mesma imagem várias vezes para a lista não ficar vazia
                     for _ in range(num_frames_to_load):
                         frames.append(img)
+                        frames_left.append(img_left)
                 except:
                      # Último caso: quadrado roxo se não tiver NADA
                     surf = pygame.Surface(self.size)
                     surf.fill((255, 0, 255)) 
                     for _ in range(num_frames_to_load):
                         frames.append(surf)
+                        frames_left.append(surf)
 
-            self.animation_db[name] = frames
+            self.animation_db[name] = (frames_left, frames)
 
         # Define a imagem inicial
-        self.image_orig = self.animation_db[self.char_list[self.char_index]][0]
+        self.image_orig = self.animation_db[self.char_list[self.char_index]][True][0]
         self.image = self.image_orig
         self.rect = self.image.get_rect()
         self.rect.center = (WIDTH / 4, HEIGHT / 2)
@@ -82,36 +98,34 @@ class Player(pygame.sprite.Sprite):
         self.frame_index = 0
         self.update_image_frame()
 
-    # Nova função para pegar o frame correto e espelhar se necessário
+    # Pega o frame correto já virado para o lado certo (sem transform por frame)
     def update_image_frame(self):
         name = self.char_list[self.char_index]
-        # Pega o frame atual da lista usando o índice
-        current_frame = self.animation_db[name][self.frame_index]
-        
-        if self.facing_right:
-            self.image = current_frame
-        else:
-            self.image = pygame.transform.flip(current_frame, True, False)
+        self.image = self.animation_db[name][self.facing_right][self.frame_index]
 
     # Função que roda todo loop para calcular a animação
     def animate(self):
-        now = pygame.time.get_ticks()
-        
-        # Só anima se estiver se movendo E no chão
+        # Só anima se estiver se movendo E no chão; a troca em si vem do timer
         if self.is_moving and self.on_ground:
-            if now - self.last_frame_update > self.animation_speed:
-                self.last_frame_update = now
-                # Avança para o próximo frame, e volta pro 0 se chegar no fim da lista (loop)
-                name = self.char_list[self.char_index]
-                total_frames = len(self.animation_db[name])
-                self.frame_index = (self.frame_index + 1) % total_frames
-                self.update_image_frame()
+            if self.timer is None:
+                self.timer = TIMERS.call_at(self.last_frame_update + self.animation_speed + 1, self.next_frame)
         else:
             # Se parou ou pulou, volta para o frame 0 (pose parada)
             if self.frame_index != 0:
                 self.frame_index = 0
                 self.update_image_frame()
 
+    def next_frame(self, now):
+        self.timer = None
+        # Parou antes do timer vencer: o animate marca de novo quando voltar a andar
+        if self.is_moving and self.on_ground:
+            self.last_frame_update = now
+            # Avança para o próximo frame, e volta pro 0 se chegar no fim da lista (loop)
+            name = self.char_list[self.char_index]
+            total_frames = len(self.animation_db[name][True])
+            self.frame_index = (self.frame_index + 1) % total_frames
+            self.update_image_frame()
+
     def update_touch(self, left, right):
         # Reseta a flag de movimento
         self.is_moving = False
@@ -135,7 +149,7 @@ class Player(pygame.sprite.Sprite):
         
         # Reseta a flag antes da colisão
         self.on_ground = False 
-        hits = pygame.sprite.spritecollide(self, self.game.platforms, False)
+        hits = self.game.platforms.collide(self)
         if hits:
             # Verifica se está caindo sobre a plataforma (não batendo de baixo para cima)
             if self.vel_y >= 0 and self.rect.bottom < hits[0].rect.bottom + 10: 
@@ -143,7 +157,9 @@ class Player(pygame.sprite.Sprite):
                 self.vel_y = 0
                 self.on_ground = True
         
-        if self.rect.left < 0: self.rect.left = 0
+        # Não deixa voltar para fora da tela (a câmera só anda para frente)
+        left_limit = self.game.camera.offset
+        if self.rect.left < left_limit: self.rect.left = left_limit
         
         # Chama a lógica de animação
         self.animate()
@@ -158,26 +174,21 @@ class Player(pygame.sprite.Sprite):
 
 # --- DEMAIS CLASSES PERMANECEM IGUAIS ---
 class Platform(pygame.sprite.Sprite):
+    SNAPSHOT = ()
+
     def __init__(self, x, y, w, h, texture_name='chao.png'):
         super().__init__()
-        self.image = pygame.Surface((w, h))
-        path = os.path.join(ASSETS_FOLDER, texture_name)
+        tile_size = int(50 * SCALE)
+        if 'chao2' in texture_name:
+            fill_color = (194, 178, 128)
+        else:
+            fill_color = (101, 67, 33)
         
         try:
-            tile_img = pygame.image.load(path).convert_alpha()
-            tile_size = int(50 * SCALE)
-            tile_img = pygame.transform.scale(tile_img, (tile_size, tile_size))
-            
-            for i in range(0, w, tile_size):
-                self.image.blit(tile_img, (i, 0))
-                if h > tile_size:
-                    if 'chao2' in texture_name:
-                        fill_color = (194, 178, 128)
-                    else:
-                        fill_color = (101, 67, 33)
-                    brown = pygame.Rect(i, tile_size, tile_size, h - tile_size)
-                    pygame.draw.rect(self.image, fill_color, brown)
+            # Pedaço da faixa de chão compartilhada, sem pixels próprios
+            self.image = ASSETS.get_tile_row(texture_name, tile_size, w, h, fill_color)
         except:
+            self.image = pygame.Surface((w, h))
             self.image.fill((101, 67, 33))
             pygame.draw.rect(self.image, (0, 255, 0), (0, 0, w, int(10*SCALE)))
 
@@ -186,13 +197,13 @@ class Platform(pygame.sprite.Sprite):
         self.rect.y = y
 
 class Flag(pygame.sprite.Sprite):
+    SNAPSHOT = ()
+
     def __init__(self, x, y):
         super().__init__()
-        path = os.path.join(ASSETS_FOLDER, 'bandeira.png')
         size = (int(60 * SCALE), int(80 * SCALE))
         try:
-            self.image = pygame.image.load(path).convert_alpha()
-            self.image = pygame.transform.scale(self.image, size)
+            self.image = ASSETS.get('bandeira.png', size)
         except:
             self.image = pygame.Surface(size)
             self.image.fill((255, 255, 0))
@@ -200,28 +211,41 @@ class Flag(pygame.sprite.Sprite):
         self.rect.x = x
         self.rect.bottom = y
 
+# Tamanho base (px em 800x450) e velocidade de cada inimigo; o resto usa o padrão
+ENEMY_BASE = {
+    'gato': ((50, 40), 3),
+    'vaca': ((70, 60), 1),
+    'caranguejo': ((45, 35), 2),
+}
+ENEMY_DEFAULT = ((40, 60), 2)
+
+def enemy_base(type_name):
+    return ENEMY_BASE.get(type_name, ENEMY_DEFAULT)
+
+def enemy_size(type_name):
+    base_size = enemy_base(type_name)[0]
+    return (int(base_size[0] * SCALE), int(base_size[1] * SCALE))
+
 class Enemy(pygame.sprite.Sprite):
+    SNAPSHOT = ('hp', 'vel_y', 'direction', 'resting', 'image')
+
     def __init__(self, x, y, type_name, game, platform=None):
         super().__init__()
         self.game = game
         self.platform = platform 
         self.type = type_name
         self.vel_y = 0 
+        # Assentado na própria plataforma: não precisa de gravidade nem colisão
+        self.resting = False
         
-        if self.type == 'gato': base_size = (50, 40); base_speed = 3
-        elif self.type == 'vaca': base_size = (70, 60); base_speed = 1
-        elif self.type == 'caranguejo': base_size = (45, 35); base_speed = 2
-        else: base_size = (40, 60); base_speed = 2
-
-        self.size = (int(base_size[0] * SCALE), int(base_size[1] * SCALE))
+        base_speed = enemy_base(self.type)[1]
+        self.size = enemy_size(self.type)
         self.speed = base_speed * SCALE
         self.hp = 10 
 
-        path = os.path.join(ASSETS_FOLDER, f'{self.type}.png')
         try:
-            img = pygame.image.load(path).convert_alpha()
-            self.image_right = pygame.transform.scale(img, self.size)
-            self.image_left = pygame.transform.flip(self.image_right, True, False)
+            self.image_right = ASSETS.get(f'{self.type}.png', self.size)
+            self.image_left = ASSETS.get(f'{self.type}.png', self.size, flip=True)
         except:
             surf = pygame.Surface(self.size)
             surf.fill((255, 0, 0))
@@ -246,13 +270,19 @@ class Enemy(pygame.sprite.Sprite):
                 self.direction = -1
 
         if self.type != 'guarda_chuva':
-            self.vel_y += GRAVITY
-            self.rect.y += self.vel_y
-            hits = pygame.sprite.spritecollide(self, self.game.platforms, False)
-            if hits:
-                if self.vel_y > 0:
-                    self.rect.bottom = hits[0].rect.top
-                    self.vel_y = 0
+            if self.resting and not self.platform.alive():
+                self.disturb()
+            # Parado na plataforma a gravidade só o desceria 1 px e a colisão o
+            # devolveria; o vai e vem fica preso às bordas dela, então nem testa
+            if not self.resting:
+                self.vel_y += GRAVITY
+                self.rect.y += self.vel_y
+                hits = self.game.platforms.collide(self)
+                if hits:
+                    if self.vel_y > 0:
+                        self.rect.bottom = hits[0].rect.top
+                        self.vel_y = 0
+                        self.resting = hits[0] is self.platform
         else:
             self.rect.y += random.choice([-2, 2])
 
@@ -261,52 +291,58 @@ class Enemy(pygame.sprite.Sprite):
         
         if self.rect.top > HEIGHT: self.kill()
 
-class Explosion(pygame.sprite.Sprite):
+    def disturb(self):
+        """Volta a cair e colidir (ex: a plataforma dele sumiu)."""
+        self.resting = False
+
+class Explosion(PooledSprite, pygame.sprite.Sprite):
     def __init__(self, center):
         super().__init__()
-        path = os.path.join(ASSETS_FOLDER, 'explosao_strip.png')
         self.frames = []
         exp_size = (int(80 * SCALE), int(80 * SCALE))
         try:
-            sheet = pygame.image.load(path).convert_alpha()
-            w, h = sheet.get_size()
-            if w > h: 
-                frame_width = h 
-                num_frames = w // h
-                for i in range(num_frames):
-                    frame = sheet.subsurface((i * frame_width, 0, frame_width, h))
-                    frame = pygame.transform.scale(frame, exp_size)
-                    self.frames.append(frame)
-            else:
-                self.frames.append(pygame.transform.scale(sheet, exp_size))
+            self.frames = ASSETS.get_strip('explosao_strip.png', exp_size)
         except:
             img = pygame.Surface(exp_size); img.fill((255,100,0))
-            self.frames.append(img)
-            
+            self.frames = [img]
+        self.frame_rate = 60
+        self.reset(center)
+
+    def reset(self, center):
         self.image = self.frames[0]
         self.rect = self.image.get_rect(center=center)
         self.frame_idx = 0
-        self.last_update = pygame.time.get_ticks()
-        self.frame_rate = 60
+        self.last_update = SIM_CLOCK.ticks
+        # Cada frame marca o próximo; sem update por frame
+        self.timer = TIMERS.call_at(self.last_update + self.frame_rate + 1, self.next_frame)
 
-    def update(self):
-        now = pygame.time.get_ticks()
-        if now - self.last_update > self.frame_rate:
-            self.last_update = now
-            self.frame_idx += 1
-            if self.frame_idx < len(self.frames):
-                self.image = self.frames[self.frame_idx]
-            else:
-                self.kill()
+    def next_frame(self, now):
+        self.timer = None
+        if not self.alive():
+            # Criada para o pool e ainda não usada
+            return
+        self.last_update = now
+        self.frame_idx += 1
+        if self.frame_idx < len(self.frames):
+            self.image = self.frames[self.frame_idx]
+            self.timer = TIMERS.call_at(now + self.frame_rate + 1, self.next_frame)
+        else:
+            self.kill()
+
+    def kill(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        super().kill()
 
 class Bone(pygame.sprite.Sprite):
+    SNAPSHOT = ('float_offset',)
+
     def __init__(self, x, y):
         super().__init__()
-        path = os.path.join(ASSETS_FOLDER, 'ossinho.png')
         self.size = (int(15 * SCALE), int(15 * SCALE))
         try:
-            self.image = pygame.image.load(path).convert_alpha()
-            self.image = pygame.transform.scale(self.image, self.size)
+            self.image = ASSETS.get('ossinho.png', self.size)
         except:
             self.image = pygame.Surface(self.size)
             self.image.fill((255, 255, 255)) 
@@ -323,20 +359,22 @@ class Bone(pygame.sprite.Sprite):
         self.rect.y = self.y_start + int(5 * math.sin(self.float_offset))
 
 class Pigeon(pygame.sprite.Sprite):
+    SNAPSHOT = ('hp', 'direction', 'last_shot', 'reloaded', 'image')
+
     def __init__(self, x, y, game):
         super().__init__()
         self.game = game
         self.size = (int(60 * SCALE), int(40 * SCALE))
         self.hp = 15
         
-        path = os.path.join(ASSETS_FOLDER, 'pomba.png')
         try:
-            img = pygame.image.load(path).convert_alpha()
-            self.image_orig = pygame.transform.scale(img, self.size)
+            self.image_orig = ASSETS.get('pomba.png', self.size)
+            self.image_flipped = ASSETS.get('pomba.png', self.size, flip=True)
         except:
             self.image_orig = pygame.Surface(self.size)
             self.image_orig.fill((150, 150, 150))
             pygame.draw.rect(self.image_orig, (200, 200, 200), (10, 10, 30, 10))
+            self.image_flipped = pygame.transform.flip(self.image_orig, True, False)
 
         self.image = self.image_orig
         self.rect = self.image.get_rect()
@@ -348,24 +386,34 @@ class Pigeon(pygame.sprite.Sprite):
         
         self.last_shot = 0
         self.shot_delay = 2000
+        # O timer da recarga marca `reloaded`; atira quando estiver na tela
+        self.reloaded = False
+        self.timer = None
+
+    def reload(self, now):
+        self.timer = None
+        self.reloaded = True
 
     def update(self):
         self.rect.x += self.speed * self.direction
+        view = self.game.camera.view
         
-        if self.rect.right < 0:
+        # Voa de um lado a outro da tela atual (coordenadas do mundo)
+        if self.rect.right < view.left:
             self.direction = 1
-            self.image = pygame.transform.flip(self.image_orig, True, False)
-        elif self.rect.left > WIDTH + 100:
+            self.image = self.image_flipped
+        elif self.rect.left > view.right + 100:
             self.direction = -1
             self.image = self.image_orig
 
-        self.rect.y += math.sin(pygame.time.get_ticks() * 0.005) * 2
+        self.rect.y += math.sin(SIM_CLOCK.ticks * 0.005) * 2
 
-        now = pygame.time.get_ticks()
-        if 0 < self.rect.centerx < WIDTH:
-            if now - self.last_shot > self.shot_delay:
-                self.last_shot = now
-                if random.random() > 0.3:
-                    poop = EnemyProjectile(self.rect.centerx, self.rect.bottom)
-                    self.game.all_sprites.add(poop)
-                    self.game.bullets_enemy.add(poop)
+        if not self.reloaded and self.timer is None:
+            self.timer = TIMERS.call_at(self.last_shot + self.shot_delay + 1, self.reload)
+        if self.reloaded and view.left < self.rect.centerx < view.right:
+            self.reloaded = False
+            self.last_shot = SIM_CLOCK.ticks
+            if random.random() > 0.3:
+                drop = PIGEON_DROPPING
+                self.game.bullets_enemy.spawn(self.rect.centerx, self.rect.bottom, 0, drop.speed,
+                                              drop.image_right, drop.damage, drop.index)
@@ -0,0 +1,59 @@
+import pygame
+from settings import *
+
+class UICache:
+    """Guarda as superfícies da interface para não recriá-las todo frame.
+
+    Botões são montados uma vez por (tamanho, texto, cor, alpha, escala),
+    fontes uma vez por tamanho e textos do HUD só são renderizados de novo
+    quando o valor muda.
+    """
+    def __init__(self, font):
+        self.font = font
+        self.fonts = {}
+        self.buttons = {}
+        self.labels = {}
+
+    def get_font(self, font_scale=1.0):
+        if font_scale == 1.0:
+            return self.font
+        size = int(30 * SCALE * font_scale)
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            self.fonts[size] = font
+        return font
+
+    def button(self, size, text, color=(255, 255, 255), alpha=80, font_scale=1.0):
+        key = (size, text, color, alpha, font_scale)
+        surf = self.buttons.get(key)
+        if surf is None:
+            surf = pygame.Surface(size, pygame.SRCALPHA)
+            pygame.draw.rect(surf, (0, 0, 0, alpha), surf.get_rect(), border_radius=15)
+            pygame.draw.rect(surf, color, surf.get_rect(), 2, border_radius=15)
+            txt_surf = self.get_font(font_scale).render(text, True, color)
+            surf.blit(txt_surf, txt_surf.get_rect(center=(size[0] // 2, size[1] // 2)))
+            self.buttons[key] = surf
+        return surf
+
+    def round_button(self, diameter, text, color=(255, 255, 255), alpha=80):
+        key = ('round', diameter, text, color, alpha)
+        surf = self.buttons.get(key)
+        if surf is None:
+            surf = pygame.Surface((diameter, diameter), pygame.SRCALPHA)
+            center = (diameter // 2, diameter // 2)
+            radius = diameter // 2
+            pygame.draw.circle(surf, (0, 0, 0, alpha), center, radius)
+            pygame.draw.circle(surf, color, center, radius, 2)
+            txt = self.font.render(text, True, color)
+            surf.blit(txt, txt.get_rect(center=center))
+            self.buttons[key] = surf
+        return surf
+
+    def label(self, slot, text, color=(255, 255, 255), font=None):
+        """Texto do HUD: só renderiza de novo se o conteúdo de `slot` mudou."""
+        cached = self.labels.get(slot)
+        if cached is None or cached[0] != (text, color):
+            cached = ((text, color), (font or self.font).render(text, True, color))
+            self.labels[slot] = cached
+        return cached[1]
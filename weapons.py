@@ -1,5 +1,7 @@
 import pygame
+from collections import namedtuple
 from settings import *
+from pool import PooledSprite
 
 WEAPONS_LIST = [
     {"name": "Osso", "color": (255, 255, 240), "damage": 2, "speed": 10 * SCALE, "size": (int(20*SCALE), int(10*SCALE))},
@@ -14,54 +16,118 @@ WEAPONS_LIST = [
     {"name": "Super Bark", "color": (255, 0, 255), "damage": 20, "speed": 6 * SCALE, "size": (int(50*SCALE), int(50*SCALE))}
 ]
 
-class Projectile(pygame.sprite.Sprite):
-    def __init__(self, x, y, direction, weapon_idx):
-        super().__init__()
-        weapon = WEAPONS_LIST[weapon_idx]
-        self.w_data = weapon
-        
+# Registro compacto de uma arma pronta para uso
+WeaponStats = namedtuple('WeaponStats', 'index name damage speed image_right image_left')
+
+class WeaponRegistry:
+    """Valida as armas e desenha a imagem de cada uma (uma por direção).
+
+    Toda arma, inclusive as criadas depois, entra por `register`, então os
+    tiros só precisam guardar a referência ao WeaponStats já pronto.
+    """
+    FIELDS = {'name': str, 'color': tuple, 'damage': (int, float), 'speed': (int, float), 'size': tuple}
+    # Formas retangulares; o resto é desenhado como bolinha
+    RECT_SHAPES = ("Laser", "Raio")
+
+    def __init__(self):
+        self.weapons = []
+
+    def validate(self, weapon):
+        for field, kind in self.FIELDS.items():
+            if field not in weapon:
+                raise ValueError(f"Arma sem o campo '{field}': {weapon}")
+            if not isinstance(weapon[field], kind):
+                raise ValueError(f"Campo '{field}' inválido na arma {weapon.get('name')}: {weapon[field]!r}")
+        w, h = weapon['size']
+        if w <= 0 or h <= 0:
+            raise ValueError(f"Tamanho inválido na arma {weapon['name']}: {weapon['size']}")
+        if len(weapon['color']) not in (3, 4):
+            raise ValueError(f"Cor inválida na arma {weapon['name']}: {weapon['color']}")
+
+    def render(self, weapon):
         # Cria superfície transparente
-        self.image = pygame.Surface(weapon['size'], pygame.SRCALPHA)
+        image = pygame.Surface(weapon['size'], pygame.SRCALPHA)
         
         # Desenha baseado no formato (Laser é retangular, resto arredondado)
         w, h = weapon['size']
         color = weapon['color']
         
-        if weapon['name'] in ["Laser", "Raio"]:
-            pygame.draw.rect(self.image, color, (0, 0, w, h), border_radius=4)
-            pygame.draw.rect(self.image, (255, 255, 255), (2, 2, w-4, h-4), border_radius=4) # Brilho interno
+        if weapon['name'] in self.RECT_SHAPES:
+            pygame.draw.rect(image, color, (0, 0, w, h), border_radius=4)
+            pygame.draw.rect(image, (255, 255, 255), (2, 2, w-4, h-4), border_radius=4) # Brilho interno
         else:
             # Desenha bolinha com borda
             radius = min(w, h) // 2
-            pygame.draw.circle(self.image, color, (w//2, h//2), radius)
-            pygame.draw.circle(self.image, (255, 255, 255), (w//2, h//2), int(radius*0.6)) # Brilho centro
+            pygame.draw.circle(image, color, (w//2, h//2), radius)
+            pygame.draw.circle(image, (255, 255, 255), (w//2, h//2), int(radius*0.6)) # Brilho centro
+        return image
 
-        self.rect = self.image.get_rect()
-        self.rect.center = (x, y)
-        
-        self.speed = weapon['speed'] * direction
-        self.damage = weapon['damage']
+    def register(self, weapon):
+        """Adiciona uma arma (dict no formato de WEAPONS_LIST). Devolve o índice."""
+        self.validate(weapon)
+        image = self.render(weapon)
+        stats = WeaponStats(
+            index=len(self.weapons),
+            name=weapon['name'],
+            damage=weapon['damage'],
+            speed=weapon['speed'],
+            image_right=image,
+            image_left=pygame.transform.flip(image, True, False),
+        )
+        self.weapons.append(stats)
+        return stats.index
 
-    def update(self):
-        self.rect.x += self.speed
-        if self.rect.right < 0 or self.rect.left > WIDTH:
-            self.kill()
+    def __getitem__(self, idx):
+        return self.weapons[idx]
+
+    def __len__(self):
+        return len(self.weapons)
+
+    def __iter__(self):
+        return iter(self.weapons)
+
+# Instância única, validada e desenhada ao importar o módulo
+WEAPONS = WeaponRegistry()
+for _weapon in WEAPONS_LIST:
+    WEAPONS.register(_weapon)
 
-class EnemyProjectile(pygame.sprite.Sprite):
-    def __init__(self, x, y):
+def _render_dropping():
+    # Caca da pomba
+    size = int(15 * SCALE)
+    image = pygame.Surface((size, size), pygame.SRCALPHA)
+    pygame.draw.circle(image, (255, 255, 255), (size//2, size//2), size//2) # Branco
+    pygame.draw.circle(image, (100, 100, 100), (size//2, size//2), size//2, 1) # Borda
+    return image
+
+# "Arma" da pomba: cai na vertical (speed é a velocidade para baixo)
+_dropping_image = _render_dropping()
+PIGEON_DROPPING = WeaponStats(index=-1, name="Caca", damage=10, speed=5 * SCALE,
+                              image_right=_dropping_image, image_left=_dropping_image)
+
+def weapon_name(index):
+    return PIGEON_DROPPING.name if index == PIGEON_DROPPING.index else WEAPONS[index].name
+
+class Projectile(PooledSprite, pygame.sprite.Sprite):
+    """Tiro genérico (do jogador ou da pomba), reaproveitado pelos pools."""
+    def __init__(self, x, y, vx, vy, image, damage, camera=None):
         super().__init__()
-        # Caca da pomba
-        size = int(15 * SCALE)
-        self.image = pygame.Surface((size, size), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (255, 255, 255), (size//2, size//2), size//2) # Branco
-        pygame.draw.circle(self.image, (100, 100, 100), (size//2, size//2), size//2, 1) # Borda
-        
-        self.rect = self.image.get_rect()
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(x, y, vx, vy, image, damage, camera)
+
+    def reset(self, x, y, vx, vy, image, damage, camera=None):
+        # A imagem já vem pronta do registro de armas: nada a desenhar
+        self.camera = camera
+        self.image = image
+        self.rect.size = image.get_size()
         self.rect.center = (x, y)
-        self.speed_y = 5 * SCALE
-        self.damage = 10
+        self.vx = vx
+        self.vy = vy
+        self.damage = damage
 
     def update(self):
-        self.rect.y += self.speed_y
-        if self.rect.top > HEIGHT:
+        self.rect.x += self.vx
+        self.rect.y += self.vy
+        # Some ao sair da tela (pelos lados ou por baixo)
+        left = self.camera.offset if self.camera else 0
+        if self.rect.right < left or self.rect.left > left + WIDTH or self.rect.top > HEIGHT:
             self.kill()